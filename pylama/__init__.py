@@ -10,4 +10,14 @@ __version__ = "8.4.1"
 LOGGER = logging.getLogger("pylama")
 
 
+def __getattr__(name):
+    # Import the API lazily: linters are loaded on import
+    if name == "Session":
+        from pylama.api import Session  # noqa
+
+        return Session
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # pylama:ignore=D
@@ -0,0 +1,142 @@
+"""Check code from memory."""
+
+import asyncio
+from concurrent.futures import Executor
+from functools import partial
+from itertools import chain
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from pylama.check_async import CPU_COUNT
+from pylama.config import CURDIR, Namespace, parse_options
+from pylama.core import run
+from pylama.errors import Error
+from pylama.lint import LINTERS, Linter
+from pylama.main import get_candidates, iter_errors
+
+
+def check_sources(
+    sources: Iterable[Tuple[str, str]],
+    options: Namespace = None,
+    rootdir: Path = CURDIR,
+) -> Iterator[Sequence[Error]]:
+    """Check the given sources and yield errors file by file, as soon as they are ready.
+
+    The files aren't read (and don't have to exist or to end with `.py`), paths are used
+    to find file params and to report errors. Sources are checked like files:
+    concurrently, when the options allow it (see `check_async.plan`), with `--max-errors`,
+    `--tiered` and so on.
+
+    :param sources: Pairs of paths and sources (paths have to be unique)
+    :param options: Parsed pylama options (from pylama.config.parse_options)
+    """
+    if options is None:
+        options = parse_options()
+
+    by_path = dict(sources)
+    if not by_path:
+        return iter(())
+
+    return iter_errors(None, options, rootdir=rootdir, sources=by_path)
+
+
+async def check_paths_async(
+    paths: Optional[List[str]],
+    options: Namespace = None,
+    rootdir: Path = CURDIR,
+    concurrency: int = CPU_COUNT,
+    executor: Executor = None,
+) -> List[Error]:
+    """Check the given paths without blocking the event loop.
+
+    Files are checked in the executor (the loop's default one, pass a process pool for
+    CPU-bound linters), no more than `concurrency` at once. When the task is cancelled,
+    pending files aren't checked.
+    """
+    if options is None:
+        options = parse_options()
+
+    candidates = [path for path in get_candidates(paths or options.paths) if path.endswith(".py")]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def check(path: str) -> List[Error]:
+        async with semaphore:
+            return await _run_async(executor, path, rootdir, options)
+
+    errors: List[Error] = []
+    for file_errors in await asyncio.gather(*map(check, candidates)):
+        errors += file_errors
+    return errors
+
+
+async def check_source_async(
+    path: str,
+    source: str,
+    options: Namespace = None,
+    rootdir: Path = CURDIR,
+    executor: Executor = None,
+) -> List[Error]:
+    """Check the given source in the executor without blocking the event loop."""
+    if options is None:
+        options = parse_options()
+
+    return await _run_async(executor, path, rootdir, options, code=source)
+
+
+async def _run_async(
+    executor: Optional[Executor], path: str, rootdir: Path, options: Namespace, code: str = None
+) -> List[Error]:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, partial(run, path, code=code, rootdir=rootdir, options=options)
+    )
+
+
+class Session:
+    """Check files and sources with the same options.
+
+    Options are parsed and linters are instantiated once, so the session can be used to
+    check a lot of files (or snippets) in a long-running service.
+    """
+
+    def __init__(self, options: Namespace = None, rootdir: Path = CURDIR):
+        """Initialize the session.
+
+        :param options: Parsed pylama options (options from the configuration files are
+            used by default)
+        """
+        self.options = parse_options(rootdir=rootdir) if options is None else options
+        self.rootdir = rootdir
+        self.linters: Dict[str, Linter] = {name: cls() for name, cls in LINTERS.items()}
+
+    def check_file(self, path: str) -> List[Error]:
+        """Check the given file."""
+        return run(path, rootdir=self.rootdir, options=self.options, linters=self.linters)
+
+    def check_source(self, path: str, source: str) -> List[Error]:
+        """Check the given source (the path is used to find file params and to report)."""
+        return run(
+            path, code=source, rootdir=self.rootdir, options=self.options, linters=self.linters
+        )
+
+    def check_many(
+        self, items: Iterable[Union[str, Tuple[str, str]]]
+    ) -> Iterator[Sequence[Error]]:
+        """Check the given paths (files or directories) and (path, source) pairs.
+
+        Errors are yielded file by file, as soon as they are ready. The checks are run
+        concurrently when the options allow it (see `check_async.plan`).
+        """
+        paths, sources = [], []
+        for item in items:
+            if isinstance(item, str):
+                paths.append(item)
+            else:
+                sources.append(item)
+
+        results = []
+        if paths:
+            results.append(iter_errors(paths, self.options, rootdir=self.rootdir))
+        if sources:
+            results.append(check_sources(sources, self.options, rootdir=self.rootdir))
+        return chain.from_iterable(results)
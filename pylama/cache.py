@@ -0,0 +1,176 @@
+"""Cache check results by file contents."""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from pkg_resources import DistributionNotFound, get_distribution
+
+from pylama import __version__
+from pylama.config import LOGGER, Namespace
+from pylama.errors import Error
+from pylama.lint import LINTERS
+from pylama.utils import get_cache_dir
+
+#: Options which don't change results of a file
+RUNTIME_OPTIONS = {
+    "abspath",
+    "async",
+    "batch_linters",
+    "cache_dir",
+    "changed_dependents",
+    "changed_since",
+    "concurrent",
+    "dir_options",
+    "discovery",
+    "executor",
+    "fail_fast",
+    "format",
+    "from_stdin",
+    "hook",
+    "jobs",
+    "max_errors",
+    "max_files_per_worker",
+    "max_worker_rss",
+    "nearest_config",
+    "options",
+    "parsed_with",
+    "paths",
+    "report",
+    "stdin_protocol",
+    "tier",
+    "verbose",
+}
+
+#: Errors which depend on the run, not on the file (timeouts)
+UNCACHED_NUMBERS = {"E002"}
+
+
+class ResultCache:
+    """Errors of files by the files' content hashes (see `vcs.get_index_files`).
+
+    Results are valid for the same options, pylama and linters versions only (see
+    `get_fingerprint`).
+    """
+
+    def __init__(self, path: Optional[Path] = None, fingerprint: str = ""):
+        """Load the results from the given file."""
+        self.path = path
+        self.fingerprint = fingerprint
+        self.values: Dict[str, list] = {}
+        self.fingerprints: Dict[int, str] = {}
+        if path and path.is_file():
+            try:
+                data = json.loads(path.read_text())
+                if data.get("fingerprint") == fingerprint:
+                    self.values = data["files"]
+            except (ValueError, KeyError, AttributeError):
+                LOGGER.info("Invalid results file: %s", path)
+
+    @classmethod
+    def from_options(cls, options: Namespace) -> Optional["ResultCache"]:
+        """Load the results from the cache directory.
+
+        Results of cross-file linters depend on other files, so they aren't cached.
+        """
+        cache_dir = get_cache_dir(options)
+        if cache_dir is None or has_cross_file(options):
+            return None
+
+        return cls(cache_dir / "results.json", get_fingerprint(options))
+
+    def get_key(self, key: str, options: Namespace) -> str:
+        """Get a key of a file's content for the file's options (see `--nearest-config`).
+
+        Files which are checked with cross-file linters get empty keys (aren't cached).
+        """
+        fingerprint = self.fingerprints.get(id(options))
+        if fingerprint is None:
+            fingerprint = ""
+            if not has_cross_file(options):
+                fingerprint = get_fingerprint(options)
+            self.fingerprints[id(options)] = fingerprint
+
+        if not key or fingerprint == self.fingerprint:
+            return key
+        return fingerprint and f"{key}:{fingerprint}"
+
+    def get(self, path: str, key: str, filename: str) -> Optional[List[Error]]:
+        """Get errors of the given file if its content hasn't been changed."""
+        cached = self.values.get(path)
+        if not key or not cached or cached[0] != key:
+            return None
+
+        return [
+            Error(filename=filename, type=etype, text=message, **info)
+            for etype, message, info in cached[1]
+        ]
+
+    def set(self, path: str, key: str, errors: List[Error]):
+        """Save errors of the given file."""
+        if not key or any(err.number in UNCACHED_NUMBERS for err in errors):
+            return
+
+        self.values[path] = [
+            key,
+            [
+                (
+                    err.etype,
+                    err.message,
+                    {"source": err.source, "col": err.col, "lnum": err.lnum, "number": err.number},
+                )
+                for err in errors
+            ],
+        ]
+
+    def save(self):
+        """Save the results."""
+        if self.path:
+            data = {"fingerprint": self.fingerprint, "files": self.values}
+            try:
+                self.path.write_text(json.dumps(data))
+            except OSError as exc:
+                LOGGER.info("Can't save results: %s", exc)
+
+
+def has_cross_file(options: Namespace) -> bool:
+    """Check the options enable cross-file linters."""
+    return any(LINTERS[name].cross_file for name in options.linters if name in LINTERS)
+
+
+def get_fingerprint(options: Namespace) -> str:
+    """Hash the options which change results with pylama's and the linters' versions."""
+    values = {
+        name: value for name, value in vars(options).items() if name not in RUNTIME_OPTIONS
+    }
+    versions = {"pylama": __version__}
+    for name in options.linters:
+        try:
+            versions[name] = get_distribution(name).version
+        except DistributionNotFound:
+            versions[name] = ""
+
+    data = json.dumps([normalize(values), versions], sort_keys=True)
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()  # noqa
+
+
+def normalize(value: Any) -> Any:
+    """Convert the given value to JSON types with a stable order."""
+    if isinstance(value, dict):
+        return {str(normalize(key)): normalize(val) for key, val in value.items()}
+
+    if isinstance(value, (set, frozenset)):
+        return sorted(map(normalize, value), key=str)
+
+    if isinstance(value, (list, tuple)):
+        return [normalize(item) for item in value]
+
+    if isinstance(value, re.Pattern):
+        return value.pattern
+
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+
+    return str(value)
@@ -1,12 +1,18 @@
 """Support for checking code asynchronously."""
 
 import logging
-from concurrent.futures import ProcessPoolExecutor
+import math
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import List
+from typing import Collection, Deque, Dict, Generator, Iterator, List, Optional, Tuple
 
 from pylama.config import Namespace
-from pylama.errors import Error
+from pylama.errors import Error, ErrorTable
+from pylama.schedule import Durations, schedule
+from pylama.utils import get_rss
 
 try:
     import multiprocessing
@@ -17,28 +23,198 @@ except (ImportError, NotImplementedError):
     CPU_COUNT = 1
 
 from pylama.core import run
+from pylama.lint import LINTERS
 
 LOGGER = logging.getLogger("pylama")
 
+#: Python is built without the global interpreter lock (PEP 703)
+FREE_THREADING = not getattr(sys, "_is_gil_enabled", lambda: True)()
 
-def worker(params):
-    """Do work."""
-    path, code, options, rootdir = params
-    return run(path, code=code, rootdir=rootdir, options=options)
+EXECUTORS = {"process": ProcessPoolExecutor, "thread": ThreadPoolExecutor}
+
+#: Expected duration (in seconds) of checks which are faster to run inline
+SERIAL_MAX_COST = 0.5
+
+#: Minimal expected duration of checks which is worth a separate worker
+MIN_COST_PER_JOB = 0.25
+
+
+def worker(params) -> Tuple[int, List[Tuple[str, float, Tuple[Tuple[str, ...], bytes]]]]:
+    """Do work.
+
+    Check a chunk of files (a chunk of sources is a dict of paths to sources). Errors are
+    sent back to the parent process packed (see `ErrorTable.pack`) with a check duration for
+    every file and the worker's memory usage.
+    """
+    paths, code, options, rootdir = params
+    results = []
+    for path in paths:
+        if isinstance(paths, dict):
+            code = paths[path]
+        started = time.perf_counter()
+        errors = run(path, code=code, rootdir=rootdir, options=options)
+        results.append((path, time.perf_counter() - started, ErrorTable(errors).pack()))
+    return get_rss(), results
+
+
+def plan(
+    paths: List[str], options: Namespace, sizes: Optional[Dict[str, int]] = None
+) -> Tuple[str, int]:
+    """Choose an executor and a number of workers to check the given paths.
+
+    Small runs are checked inline. Thread-safe linters which wait for subprocesses or I/O
+    (or any thread-safe linters on free-threaded Python) are run in threads, everything else
+    is run in processes.
+
+    :param sizes: Sizes of sources which are checked from memory
+    """
+    jobs = max(min(options.jobs or CPU_COUNT, len(paths)), 1)
+    executor = options.executor
+    if executor != "auto":
+        return executor, jobs
+
+    cost = sum(Durations.from_options(options).estimate(paths, sizes).values())
+    jobs = min(jobs, math.ceil(cost / MIN_COST_PER_JOB))
+    linters = [LINTERS[name] for name in options.linters if name in LINTERS]
+    if jobs < 2 or cost < SERIAL_MAX_COST:
+        executor = "serial"
+    elif linters and all(
+        linter.thread_safe and (linter.io_bound or FREE_THREADING) for linter in linters
+    ):
+        executor = "thread"
+    elif "pylint" in options.linters:
+        executor = "serial"
+    else:
+        executor = "process"
+
+    LOGGER.info("Plan: %s executor, %d jobs, expected cost %.2fs", executor, jobs, cost)
+    return executor, jobs
 
 
 def check_async(
     paths: List[str], code: str = None, options: Namespace = None, rootdir: Path = None
 ) -> List[Error]:
     """Check given paths asynchronously."""
-    with ProcessPoolExecutor(CPU_COUNT) as pool:
-        return [
-            err
-            for res in pool.map(
-                worker, [(path, code, options, rootdir) for path in paths]
-            )
-            for err in res
-        ]
+    errors: List[Error] = []
+    for res in iter_async(paths, code=code, options=options, rootdir=rootdir):
+        errors += res
+    return errors
+
+
+def iter_async(
+    paths: List[str],
+    code: str = None,
+    options: Namespace = None,
+    rootdir: Path = None,
+    executor: str = "process",
+    jobs: int = CPU_COUNT,
+    sources: Dict[str, str] = None,
+    ordered: bool = True,
+) -> Generator[ErrorTable, None, None]:
+    """Check given paths asynchronously and yield errors for each file.
+
+    Files are scheduled by their expected durations (see `pylama.schedule`). Process pools
+    are recycled after `--max-files-per-worker` files per worker or when a worker grows
+    over `--max-worker-rss`.
+
+    :param sources: Sources of the paths which are checked from memory
+    :param ordered: Yield the errors in the order of the paths (otherwise each file's
+        errors are yielded as soon as the file is checked)
+    """
+    durations = Durations.from_options(options)
+    chunks: Deque[Collection[str]]
+    if sources:
+        sizes = {path: len(source) for path, source in sources.items()}
+        chunks = deque(
+            {path: sources[path] for path in chunk}
+            for chunk in schedule(paths, durations, jobs, sizes)
+        )
+    else:
+        chunks = deque(schedule(paths, durations, jobs))
+    results = iter_chunks(chunks, executor, jobs, durations, (code, options, rootdir))
+    try:
+        if not ordered:
+            yield from (errors for _, errors in results)
+            return
+
+        # Keep the results of the files which are checked ahead of their turn
+        order = {path: idx for idx, path in enumerate(paths)}
+        ready: Dict[int, ErrorTable] = {}
+        idx = 0
+        for path, errors in results:
+            ready[order[path]] = errors
+            while idx in ready:
+                yield ready.pop(idx)
+                idx += 1
+
+        yield from (ready[idx] for idx in sorted(ready))
+
+    finally:
+        results.close()
+        durations.save()
+
+
+def iter_chunks(
+    chunks: Deque[Collection[str]],
+    executor: str,
+    jobs: int,
+    durations: Durations,
+    params: Tuple,
+) -> Generator[Tuple[str, ErrorTable], None, None]:
+    """Check the chunks in pools (recycled when they have to be, see `iter_pool`)."""
+    while chunks:
+        yield from iter_pool(chunks, executor, jobs, durations, params)
+
+
+def iter_pool(
+    chunks: Deque[Collection[str]],
+    executor: str,
+    jobs: int,
+    durations: Durations,
+    params: Tuple,
+) -> Iterator[Tuple[str, ErrorTable]]:
+    """Check the chunks in a new pool until it has to be recycled (yield files' errors).
+
+    New chunks are submitted as the running ones complete. When the pool has to be recycled,
+    it stops taking chunks, the running ones are finished and the rest stay in the queue.
+    When the iterator is closed early, pending chunks are cancelled.
+    """
+    options = params[1]
+    max_files, max_rss = 0, 0
+    if options and executor == "process":
+        max_files = options.max_files_per_worker * jobs
+        max_rss = options.max_worker_rss * 2 ** 20
+
+    files, recycle = 0, False
+    pool = EXECUTORS[executor](jobs)
+    running: set = set()
+    try:
+        while True:
+            while chunks and not recycle and len(running) < jobs * 2:
+                chunk = chunks.popleft()
+                running.add(pool.submit(worker, (chunk, *params)))
+                files += len(chunk)
+                recycle = bool(max_files) and files >= max_files
+
+            if not running:
+                break
+
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                rss, results = future.result()
+                if max_rss and rss > max_rss:
+                    LOGGER.info("Recycle workers, memory usage: %d MB", rss // 2 ** 20)
+                    recycle = True
+
+                for path, duration, packed in results:
+                    durations.update(path, duration)
+                    yield path, ErrorTable.unpack(packed)
+
+    finally:
+        # Checking may be stopped early (see `--max-errors`): cancel pending chunks
+        for future in running:
+            future.cancel()
+        pool.shutdown(wait=not running)
 
 
 # pylama:ignore=W0212,D210,F0001
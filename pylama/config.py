@@ -5,6 +5,7 @@ import os
 import re
 import sys
 from argparse import ArgumentParser, Namespace
+from os import path as op
 from pathlib import Path
 from typing import Any, Collection, Dict, List, Optional, Set, Union
 
@@ -119,19 +120,110 @@ def setup_parser() -> ArgumentParser:
         help="Interpret the stdin as a python script, "
         "whose filename needs to be passed as the path argument.",
     )
+    parser.add_argument(
+        "--stdin-protocol",
+        choices=["ndjson"],
+        help="Read records from stdin and write results to stdout as soon as each record "
+        'is checked. ndjson: one `{"path": ..., "source": ...}` object per line.',
+    )
+    parser.add_argument(
+        "--nearest-config",
+        action="store_true",
+        default=_Default(False),
+        help="Use the nearest configuration file with pylama's sections in a checked file's "
+        "directory or its parents (up to the current directory) for the file.",
+    )
+    parser.add_argument(
+        "--discovery",
+        choices=["walk", "git"],
+        default=_Default("walk"),
+        help="Find files in directories by walking them or in the git index (untracked and "
+        "ignored files are skipped, results of unchanged files are cached).",
+    )
+    parser.add_argument(
+        "--changed-since",
+        metavar="REF",
+        help="Check only the files which have been changed since the given git ref.",
+    )
+    parser.add_argument(
+        "--changed-dependents",
+        action="store_true",
+        help="With `--changed-since`, check the files which import the changed ones too "
+        "(when cross-file linters are enabled: mypy, pylint, vulture).",
+    )
     parser.add_argument(
         "--concurrent",
         "--async",
         action="store_true",
-        help="Enable async mode. Useful for checking a lot of files. ",
+        help="Enable async mode. Useful for checking a lot of files. "
+        "Pylama chooses how to run the checks (same as `--executor=auto`).",
+    )
+    parser.add_argument(
+        "--executor",
+        choices=["auto", "serial", "thread", "process"],
+        help="Choose how to run the checks: inline, in a thread pool or in a process pool. "
+        "`auto` decides by the files, the linters and the recorded durations.",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        default=_Default(0),
+        type=int,
+        help="Maximum number of workers for concurrent checking (default: CPU count).",
+    )
+    parser.add_argument(
+        "--tiered",
+        action="store_true",
+        help="Run cheap linters over all the files first, then the expensive ones "
+        "(pylint, mypy, vulture).",
+    )
+    parser.add_argument(
+        "--tiered-skip-failed",
+        action="store_true",
+        help="With `--tiered`, don't run expensive linters for files which already have errors.",
+    )
+    parser.add_argument(
+        "--max-errors",
+        default=_Default(0),
+        type=int,
+        metavar="N",
+        help="Stop checking after N errors are found.",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop checking after the first error (same as `--max-errors=1`).",
+    )
+    parser.add_argument(
+        "--timeout-per-file",
+        default=_Default(0),
+        type=float,
+        metavar="SECONDS",
+        help="Stop checking a file after the given time and report a timeout error (E002). "
+        "Per-linter limits are set with `timeout` in linter sections.",
+    )
+    parser.add_argument(
+        "--max-files-per-worker",
+        default=_Default(0),
+        type=int,
+        metavar="N",
+        help="Replace worker processes after they have checked N files.",
+    )
+    parser.add_argument(
+        "--max-worker-rss",
+        default=_Default(0),
+        type=int,
+        metavar="MB",
+        help="Replace worker processes when one of them uses more memory than MB.",
     )
 
     parser.add_argument(
         "--format",
         "-f",
         default=_Default("pycodestyle"),
-        choices=["pydocstyle", "pycodestyle", "pylint", "parsable", "json"],
-        help="Choose output format.",
+        choices=["pydocstyle", "pycodestyle", "pylint", "parsable", "json", "jsonl", "sarif"],
+        help="Choose output format. With concurrent checks, files are reported in order, "
+        "but jsonl and sarif report each file as soon as it's checked.",
     )
     parser.add_argument(
         "--abspath",
@@ -174,6 +266,12 @@ def setup_parser() -> ArgumentParser:
         help="Sort result by error types. Ex. E,W,D",
     )
     parser.add_argument("--report", "-r", help="Send report to file [REPORT]")
+    parser.add_argument(
+        "--cache-dir",
+        default=_Default(".pylama_cache"),
+        metavar="DIR",
+        help="Directory for caches (file durations, etc). Empty value disables caching.",
+    )
     parser.add_argument(
         "--hook", action="store_true", help="Install Git (Mercurial) hook."
     )
@@ -185,9 +283,16 @@ def setup_parser() -> ArgumentParser:
 
 
 def parse_options(  # noqa
-    args: List[str] = None, config: bool = True, rootdir: Path = CURDIR, **overrides
+    args: List[str] = None,
+    config: bool = True,
+    rootdir: Path = CURDIR,
+    masks_prefix: str = "",
+    **overrides,
 ) -> Namespace:
-    """Parse options from command line and configuration files."""
+    """Parse options from command line and configuration files.
+
+    :param masks_prefix: A path which masks of file sections are relative to
+    """
     # Parse args from command string
     parser = setup_parser()
     actions = dict(
@@ -197,6 +302,10 @@ def parse_options(  # noqa
     options = parser.parse_args(args or [])
     options.file_params = {}
     options.linters_params = {}
+    options.tier = None
+    options.batch_linters = set()
+    options.dir_options = {}
+    options.parsed_with = (list(args or []), overrides)
 
     # Compile options from ini
     if config:
@@ -224,6 +333,8 @@ def parse_options(  # noqa
                 options.linters_params[name] = dict(opts)
                 continue
 
+            if masks_prefix:
+                name = op.join(masks_prefix, name)
             mask = re.compile(fnmatch.translate(fix_pathname_sep(name)))
             options.file_params[mask] = dict(opts)
 
@@ -237,13 +348,83 @@ def parse_options(  # noqa
         if isinstance(value, _Default):
             setattr(options, name, process_value(actions, name, value.value))
 
-    if options.concurrent and "pylint" in options.linters:
+    if not options.executor:
+        options.executor = "auto" if options.concurrent else "serial"
+
+    if options.executor == "process" and "pylint" in options.linters:
         LOGGER.warning("Can't parse code asynchronously with pylint enabled.")
-        options.concurrent = False
+        options.executor = "serial"
+
+    options.concurrent = options.executor != "serial"
+
+    if options.fail_fast:
+        options.max_errors = 1
 
     return options
 
 
+def get_pylama_config_file(directory: Path) -> Optional[str]:
+    """Search for a configuration file with pylama's sections in the given directory.
+
+    Files which only configure other tools (`[tool.black]`, `[flake8]`) are skipped.
+    """
+    for filename in CONFIG_FILES:
+        path = directory / filename
+        if not path.is_file() or not os.access(path, os.R_OK):
+            continue
+
+        config = get_config(path.as_posix())
+        if any(name.split(":")[0] == DEFAULT_SECTION for name in config.sections):
+            return path.as_posix()
+
+    return None
+
+
+def get_dir_options(options: Namespace, path: str, rootdir: Path = CURDIR) -> Namespace:
+    """Get effective options for the given file with `--nearest-config`.
+
+    Options are taken from the nearest configuration file with pylama's sections in the
+    file's directory or its parents up to the root directory (the given options are used
+    there). Command line options take precedence as usual, masks of file sections are
+    relative to the configuration file. The options are resolved once per directory.
+    """
+    if not options.nearest_config or options.options != DEFAULT_CONFIG_FILE:
+        return options
+
+    return resolve_dir_options(options, op.dirname(op.abspath(path)), op.abspath(rootdir))
+
+
+def resolve_dir_options(options: Namespace, directory: str, rootdir: str) -> Namespace:
+    """Resolve and memoize options for the given directory."""
+    resolved = options.dir_options.get(directory)
+    if resolved is not None:
+        return resolved
+
+    parent = op.dirname(directory)
+    config_file = None
+    if directory not in (rootdir, parent):
+        config_file = get_pylama_config_file(Path(directory))
+
+    if config_file:
+        args, overrides = options.parsed_with
+        resolved = parse_options(
+            [*args, "--options", config_file],
+            rootdir=Path(directory),
+            masks_prefix=op.relpath(directory, rootdir),
+            **overrides,
+        )
+        LOGGER.info("Use config %s for %s", config_file, directory)
+
+    elif directory in (rootdir, parent):
+        resolved = options
+
+    else:
+        resolved = resolve_dir_options(options, parent, rootdir)
+
+    options.dir_options[directory] = resolved
+    return resolved
+
+
 def process_value(actions: Dict, name: str, value: Any) -> Any:
     """Compile option value."""
     action = actions.get(name)
@@ -297,9 +478,9 @@ def get_config_toml(toml_path: str) -> inirama.Namespace:
 def setup_logger(options: Namespace):
     """Do the logger setup with options."""
     LOGGER.setLevel(logging.INFO if options.verbose else logging.WARN)
-    if options.report:
-        LOGGER.removeHandler(STREAM)
-        LOGGER.addHandler(logging.FileHandler(options.report, mode="w"))
+    # Keep stdout for the results of `--stdin-protocol`
+    if options.stdin_protocol:
+        STREAM.setStream(sys.stderr)
 
     if options.options:
         LOGGER.info("Try to read configuration from: %r", options.options)
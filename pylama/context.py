@@ -3,12 +3,15 @@
 import ast
 import os.path as op
 import re
+import shutil
+import tokenize
 from argparse import Namespace
-from copy import copy
 from functools import lru_cache
+from io import StringIO
+from multiprocessing.util import Finalize
 from pathlib import Path
 from tempfile import NamedTemporaryFile, mkdtemp
-from typing import Dict, List, Set
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
 
 from pylama.errors import Error
 from pylama.utils import read
@@ -20,6 +23,9 @@ MODELINE_RE = re.compile(
 
 SKIP_PATTERN = re.compile(r"# *noqa\b", re.I).search
 
+#: Linter params which are handled by pylama and aren't passed to the linters
+PYLAMA_PARAMS = {"timeout"}
+
 
 class RunContext:  # pylint: disable=R0902
     """Manage resources."""
@@ -38,6 +44,9 @@ class RunContext:  # pylint: disable=R0902
         "_source",
         "_tempfile",
         "_lines",
+        "_tokens",
+        "_noqa",
+        "_params",
     )
 
     def __init__(self, filename: str, source: str = None, options: Namespace = None):
@@ -55,6 +64,9 @@ class RunContext:  # pylint: disable=R0902
         self._source = source
         self._tempfile = None
         self._lines = None
+        self._tokens = None
+        self._noqa: Optional[FrozenSet[int]] = None
+        self._params: Dict[str, Dict] = {}
 
         if options:
             if options.abspath:
@@ -88,9 +100,8 @@ class RunContext:  # pylint: disable=R0902
     def __exit__(self, etype, evalue, _):
         """Exit from the context."""
         if self._tempfile is not None:
-            tmpfile = Path(self._tempfile)
-            tmpfile.unlink()
-            tmpfile.parent.rmdir()
+            Path(self._tempfile).unlink()
+            self._tempfile = None
 
         if evalue is not None:
             if etype is IOError:
@@ -123,6 +134,22 @@ class RunContext:  # pylint: disable=R0902
             self._lines = self.source.splitlines(True)
         return self._lines
 
+    @property
+    def tokens(self):
+        """Tokenize the source."""
+        if self._tokens is None:
+            self._tokens = list(tokenize.generate_tokens(StringIO(self.source).readline))
+        return self._tokens
+
+    @property
+    def noqa(self) -> FrozenSet[int]:
+        """Get numbers of the lines which are marked with `noqa`."""
+        if self._noqa is None:
+            self._noqa = frozenset(
+                lnum for lnum, line in enumerate(self.lines, 1) if SKIP_PATTERN(line)
+            )
+        return self._noqa
+
     @property
     def ast(self):
         """Get the AST for the source."""
@@ -130,9 +157,18 @@ class RunContext:  # pylint: disable=R0902
             self._ast = compile(self.source, self.filename, "exec", ast.PyCF_ONLY_AST)
         return self._ast
 
+    @property
+    def from_stdin(self) -> bool:
+        """The source is given in memory (it can differ from the file)."""
+        return self._from_stdin
+
     @property
     def temp_filename(self):
-        """Get a filename for run external command."""
+        """Get a filename for run external command.
+
+        Files for the code from stdin are written to a directory which is shared by the
+        contexts of the process. Prefer passing the source in memory when a linter can.
+        """
         if not self._from_stdin:
             return self.filename
 
@@ -141,7 +177,7 @@ class RunContext:  # pylint: disable=R0902
                 "w",
                 encoding="utf8",
                 suffix=".py",
-                dir=mkdtemp(prefix="pylama_"),
+                dir=get_temp_dir(),
                 delete=False,
             )
             file.write(self.source)
@@ -161,16 +197,59 @@ class RunContext:  # pylint: disable=R0902
         if skip is not None:
             self.skip = bool(int(skip))
 
-    @lru_cache(42)
+    def release(self, linters: Iterable):
+        """Release parsed resources which none of the given linters needs."""
+        linters = list(linters)
+        if not any(linter.needs_ast for linter in linters):
+            self._ast = None
+        if not any(linter.needs_tokens for linter in linters):
+            self._tokens = None
+        if not any(linter.needs_lines for linter in linters):
+            if self._lines is not None:
+                # Errors are still filtered by noqa marks
+                self._noqa = self.noqa
+            self._lines = None
+
+    def is_ignored(self, name: str, codes: Iterable[str]) -> bool:
+        """Check that all the given code prefixes are ignored for a linter."""
+        codes = list(codes)
+        disabled = tuple(self.get_disabled(name, codes))
+        return bool(codes) and all(code.startswith(disabled) for code in codes)
+
+    def get_disabled(self, name: str, codes: Iterable[str] = ()) -> Set[str]:
+        """Get ignored rules which can be disabled in a linter itself.
+
+        Rules which intersect with the selected ones are skipped. When code prefixes are
+        given only the rules which match them are returned.
+        """
+        select = self.select | self.get_filter(name, "select")
+        ignore = self.ignore | self.get_filter(name, "ignore")
+        codes = list(codes)
+        return {
+            rule
+            for rule in ignore
+            if rule
+            and not any(_overlap(rule, code) for code in select)
+            and (not codes or any(_overlap(rule, code) for code in codes))
+        }
+
     def get_params(self, name: str) -> Dict:
-        """Get params for a linter with the given name."""
-        lparams = copy(self.linters_params.get(name, {}))
-        for key in ("ignore", "select"):
-            if key in lparams and not isinstance(lparams[key], set):
-                lparams[key] = set(lparams[key].split(","))
+        """Get params for a linter with the given name.
+
+        The params are prepared once per context (contexts aren't shared between threads).
+        """
+        lparams = self._params.get(name)
+        if lparams is None:
+            lparams = self._params[name] = {
+                key: value
+                for key, value in self.linters_params.get(name, {}).items()
+                if key not in PYLAMA_PARAMS
+            }
+            for key in ("ignore", "select"):
+                if key in lparams and not isinstance(lparams[key], set):
+                    lparams[key] = set(lparams[key].split(","))
         return lparams
 
-    @lru_cache(42)
     def get_filter(self, name: str, key: str) -> Set:
         """Get select/ignore from linter params."""
         lparams = self.get_params(name)
@@ -181,7 +260,7 @@ class RunContext:  # pylint: disable=R0902
         err = Error(filename=self.filename, **params)
         number = err.number
 
-        if len(self.lines) >= err.lnum and SKIP_PATTERN(self.lines[err.lnum - 1]):
+        if err.lnum in self.noqa:
             return None
 
         if filtrate:
@@ -195,3 +274,19 @@ class RunContext:  # pylint: disable=R0902
                     return None
 
         return self.errors.append(err)
+
+
+@lru_cache(None)
+def get_temp_dir() -> str:
+    """Create a temporary directory for the process, it's removed at exit.
+
+    Unlike `atexit` callbacks, multiprocessing's finalizers are run in pool workers too
+    (and aren't inherited by forked ones).
+    """
+    path = mkdtemp(prefix="pylama_")
+    Finalize(None, shutil.rmtree, args=(path, True), exitpriority=0)
+    return path
+
+
+def _overlap(rule: str, code: str) -> bool:
+    return rule.startswith(code) or code.startswith(rule)
@@ -3,22 +3,45 @@
 Prepare params, check a modeline and run the checkers.
 """
 import os.path as op
+import signal
+import threading
+import time
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
-from typing import List
+from typing import Collection, Dict, Iterator, List, Optional, Tuple, Type
 
-from pylama.config import CURDIR, LOGGER, Namespace
+from pylama.config import CURDIR, LOGGER, Namespace, get_dir_options
 from pylama.context import RunContext
 from pylama.errors import Error, default_sorter, remove_duplicates
-from pylama.lint import LINTERS, LinterV2
+from pylama.lint import LINTERS, Linter, LinterV2
+
+
+class CheckTimeout(BaseException):
+    """A check took too long.
+
+    It isn't an `Exception`, so linters which catch everything can't swallow it.
+    """
 
 
 def run(
-    path: str, code: str = None, rootdir: Path = CURDIR, options: Namespace = None
+    path: str,
+    code: str = None,
+    rootdir: Path = CURDIR,
+    options: Namespace = None,
+    linters: Dict[str, Linter] = None,
 ) -> List[Error]:
     """Run code checkers with the given params.
 
     :param path: (str) A file's path.
+    :param linters: Linter instances to reuse by their names
     """
+    file_timeout = options.timeout_per_file if options else 0
+    max_errors = options.max_errors if options else 0
+    tier = options.tier if options else None
+    exclude = options.batch_linters if options else ()
+    deadline = time.monotonic() + file_timeout if file_timeout else None
+    if options:
+        options = get_dir_options(options, path, rootdir)
     path = op.relpath(path, rootdir)
 
     with RunContext(path, code, options) as ctx:
@@ -26,24 +49,99 @@ def run(
             LOGGER.info("Skip checking for path: %s", path)
 
         else:
-            for lname in ctx.linters or LINTERS:
-                linter_cls = LINTERS.get(lname)
-                if not linter_cls:
-                    continue
-                linter = linter_cls()
+            selected = get_linters(ctx, tier, exclude)
+            for idx, (lname, linter_cls) in enumerate(selected, 1):
+                linter = linters.get(lname) if linters else None
+                if linter is None:
+                    linter = linter_cls()
                 LOGGER.info("Run [%s] %s", lname, path)
-                if isinstance(linter, LinterV2):
-                    linter.run_check(ctx)
-                else:
-                    for err_info in linter.run(
-                        ctx.temp_filename, code=ctx.source, params=ctx.get_params(lname)
-                    ):
-                        ctx.push(source=lname, **err_info)
 
-    if not ctx.errors:
-        return ctx.errors
+                limit = float(ctx.linters_params.get(lname, {}).get("timeout", 0))
+                if deadline is not None:
+                    remains = max(deadline - time.monotonic(), 1e-3)
+                    limit = min(limit or remains, remains)
+
+                try:
+                    if linter.thread_safe:
+                        run_linter(linter, lname, ctx, limit)
+                    else:
+                        with linter.lock:
+                            run_linter(linter, lname, ctx, limit)
+
+                except CheckTimeout:
+                    LOGGER.info("Timeout [%s] %s", lname, path)
+                    if deadline is None or time.monotonic() < deadline:
+                        ctx.push(number="E002", text=f"Timeout: {lname} took more than {limit:g}s")
+
+                ctx.release(cls for _, cls in selected[idx:])
+
+                if deadline is not None and time.monotonic() >= deadline:
+                    ctx.push(
+                        number="E002",
+                        text=f"Timeout: checking took more than {file_timeout:g}s ({lname})",
+                    )
+                    break
+
+                if max_errors and len(ctx.errors) >= max_errors:
+                    LOGGER.info("Skip the rest linters for path: %s", path)
+                    break
+
+    return process_errors(ctx.errors, options)
+
+
+def run_batch(
+    paths: List[str],
+    linters: Collection[str],
+    code: str = None,
+    rootdir: Path = CURDIR,
+    options: Namespace = None,
+    sources: Dict[str, str] = None,
+) -> List[List[Error]]:
+    """Check the given files with batch linters (see `LinterV2.run_batch`).
+
+    Every linter gets all the files it has to check at once. Errors are returned per file
+    (in the same order as the paths).
+
+    :param sources: Sources of the paths which are checked from memory
+    """
+    tier = options.tier if options else None
+    with ExitStack() as stack:
+        contexts = [
+            stack.enter_context(
+                RunContext(
+                    op.relpath(path, rootdir),
+                    sources[path] if sources else code,
+                    options and get_dir_options(options, path, rootdir),
+                )
+            )
+            for path in paths
+        ]
+        for lname in linters:
+            linter_contexts = [
+                ctx
+                for ctx in contexts
+                if not ctx.skip and any(name == lname for name, _ in get_linters(ctx, tier))
+            ]
+            if not linter_contexts:
+                continue
+
+            linter = LINTERS[lname]()
+            LOGGER.info("Run [%s] for %d files", lname, len(linter_contexts))
+            if linter.thread_safe:
+                linter.run_batch(linter_contexts)
+            else:
+                with linter.lock:
+                    linter.run_batch(linter_contexts)
 
-    errors = list(remove_duplicates(ctx.errors))
+    return [process_errors(ctx.errors, ctx.options) for ctx in contexts]
+
+
+def process_errors(errors: List[Error], options: Namespace = None) -> List[Error]:
+    """Remove duplicates and sort errors of a file."""
+    if not errors:
+        return errors
+
+    errors = list(remove_duplicates(errors))
 
     sorter = default_sorter
     if options and options.sort:
@@ -53,4 +151,64 @@ def run(
     return sorted(errors, key=sorter)
 
 
+def get_linters(
+    ctx: RunContext, tier: Optional[int] = None, exclude: Collection[str] = ()
+) -> List[Tuple[str, Type[LinterV2]]]:
+    """Get linters to check the context with.
+
+    Linters of other tiers, excluded linters and linters which all codes are ignored are
+    skipped.
+    """
+    linters = []
+    for lname in ctx.linters or LINTERS:
+        linter_cls = LINTERS.get(lname)
+        if not linter_cls or (tier is not None and linter_cls.tier != tier):
+            continue
+        if lname in exclude:
+            continue
+        if ctx.is_ignored(lname, linter_cls.codes):
+            LOGGER.info("Skip [%s], all its codes are ignored: %s", lname, ctx.filename)
+            continue
+        linters.append((lname, linter_cls))
+    return linters
+
+
+def run_linter(linter: Linter, lname: str, ctx: RunContext, limit: float = 0):
+    """Check the context with the given linter."""
+    with time_limit(limit):
+        if isinstance(linter, LinterV2):
+            linter.run_check(ctx)
+        else:
+            path = ctx.temp_filename if linter.needs_file else ctx.filename
+            for err_info in linter.run(path, code=ctx.source, params=ctx.get_params(lname)):
+                ctx.push(source=lname, **err_info)
+
+
+@contextmanager
+def time_limit(seconds: Optional[float]) -> Iterator[None]:
+    """Raise `CheckTimeout` in the block when it runs longer than the given seconds.
+
+    Timers are signal-based, so limits work in the main thread on systems with SIGALRM only
+    (in serial mode and in worker processes).
+    """
+    if (
+        not seconds
+        or not hasattr(signal, "setitimer")
+        or threading.current_thread() is not threading.main_thread()
+    ):
+        yield
+        return
+
+    def handler(*_):
+        raise CheckTimeout()
+
+    previous = signal.signal(signal.SIGALRM, handler)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
 # pylama:ignore=R0912,D210,F0001,C3001
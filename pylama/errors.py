@@ -2,8 +2,24 @@
 from __future__ import annotations
 
 import re
+from array import array
 from collections import defaultdict
-from typing import Any, DefaultDict, Dict, Generator, List, Set, Tuple
+from collections.abc import Sequence
+from typing import (
+    Any,
+    Callable,
+    DefaultDict,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    overload,
+)
 
 PATTERN_NUMBER = re.compile(r"^\s*([A-Z]\d+)\s*", re.I)
 
@@ -104,9 +120,15 @@ class Error:
         }
 
 
-def remove_duplicates(errors: List[Error]) -> Generator[Error, None, None]:
-    """Filter duplicates from given error's list."""
-    passed: DefaultDict[int, Set] = defaultdict(set)
+def remove_duplicates(
+    errors: Iterable[Error], passed: Optional[DefaultDict[int, Set]] = None
+) -> Generator[Error, None, None]:
+    """Filter duplicates from given error's list.
+
+    :param passed: Duplicates state from the file's previously filtered errors
+    """
+    if passed is None:
+        passed = defaultdict(set)
     for error in errors:
         key = error.source, error.number
         if key in DUPLICATES:
@@ -121,4 +143,207 @@ def default_sorter(err: Error) -> Any:
     return err.lnum
 
 
+class ErrorTable(Sequence):
+    """Store a lot of errors in compact columns.
+
+    Filenames, sources, numbers, types and messages are interned into a shared table of
+    strings and the columns keep only indexes. Line numbers and columns are stored in
+    integer arrays. `Error` objects are created on access only.
+    """
+
+    __slots__ = (
+        "strings",
+        "_index",
+        "filenames",
+        "sources",
+        "numbers",
+        "etypes",
+        "messages",
+        "lnums",
+        "cols",
+    )
+
+    columns = ("filenames", "sources", "numbers", "etypes", "messages", "lnums", "cols")
+
+    def __init__(self, errors: Iterable[Error] = ()):
+        """Initialize the table."""
+        self.strings: List[str] = []
+        self._index: Dict[str, int] = {}
+        self.filenames = array("i")
+        self.sources = array("i")
+        self.numbers = array("i")
+        self.etypes = array("i")
+        self.messages = array("i")
+        self.lnums = array("i")
+        self.cols = array("i")
+        self.extend(errors)
+
+    def __len__(self) -> int:
+        """Get number of the stored errors."""
+        return len(self.lnums)
+
+    def __iter__(self) -> Iterator[Error]:
+        """Iterate through the errors."""
+        for idx in range(len(self)):
+            yield self.get(idx)
+
+    @overload
+    def __getitem__(self, idx: int) -> Error:
+        ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> List[Error]:
+        ...
+
+    def __getitem__(self, idx: Union[int, slice]) -> Union[Error, List[Error]]:
+        """Get an error (or a list of errors) by the given index."""
+        if isinstance(idx, slice):
+            return [self.get(n) for n in range(*idx.indices(len(self)))]
+        return self.get(range(len(self))[idx])
+
+    def __iadd__(self, errors: Iterable[Error]) -> ErrorTable:
+        """Add the given errors."""
+        self.extend(errors)
+        return self
+
+    def __repr__(self):
+        return f"<ErrorTable: {len(self)} errors>"
+
+    def __reduce__(self):
+        """Pickle the table in the packed form."""
+        return ErrorTable.unpack, (self.pack(),)
+
+    def pack(self) -> Tuple[Tuple[str, ...], bytes]:
+        """Pack the table to the table of strings and a buffer with all the columns."""
+        buffer = array("i")
+        for name in self.columns:
+            buffer.extend(getattr(self, name))
+        return tuple(self.strings), buffer.tobytes()
+
+    @classmethod
+    def unpack(cls, packed: Tuple[Tuple[str, ...], bytes]) -> ErrorTable:
+        """Create a table from the packed data (see `ErrorTable.pack`)."""
+        strings, data = packed
+        buffer = array("i")
+        buffer.frombytes(data)
+        size = len(buffer) // len(cls.columns)
+
+        table = cls()
+        table.strings = list(strings)
+        table._index = {value: idx for idx, value in enumerate(strings)}
+        for num, name in enumerate(cls.columns):
+            start = num * size
+            setattr(table, name, buffer[start:start + size])
+        return table
+
+    def intern(self, value: str) -> int:
+        """Get an index of the given string in the table of strings."""
+        idx = self._index.get(value)
+        if idx is None:
+            idx = self._index[value] = len(self.strings)
+            self.strings.append(value)
+        return idx
+
+    def get(self, idx: int) -> Error:
+        """Create an error by the given index."""
+        strings = self.strings
+        err = Error.__new__(Error)
+        err.filename = strings[self.filenames[idx]]
+        err.source = strings[self.sources[idx]]
+        err.number = strings[self.numbers[idx]]
+        err.etype = strings[self.etypes[idx]]
+        err.message = strings[self.messages[idx]]
+        err.lnum = self.lnums[idx]
+        err.col = self.cols[idx]
+        return err
+
+    def append(self, err: Error):
+        """Add the given error."""
+        intern = self.intern
+        self.filenames.append(intern(err.filename))
+        self.sources.append(intern(err.source))
+        self.numbers.append(intern(err.number))
+        self.etypes.append(intern(err.etype))
+        self.messages.append(intern(err.message))
+        self.lnums.append(err.lnum)
+        self.cols.append(err.col)
+
+    def extend(self, errors: Iterable[Error]):
+        """Add the given errors."""
+        if not isinstance(errors, ErrorTable):
+            for err in errors:
+                self.append(err)
+            return
+
+        mapping = [self.intern(value) for value in errors.strings]
+        for name in ("filenames", "sources", "numbers", "etypes", "messages"):
+            getattr(self, name).extend(mapping[idx] for idx in getattr(errors, name))
+        self.lnums.extend(errors.lnums)
+        self.cols.extend(errors.cols)
+
+    def take(self, indexes: Iterable[int]) -> ErrorTable:
+        """Create a new table from the rows with the given indexes."""
+        table = ErrorTable()
+        table.strings = self.strings[:]
+        table._index = dict(self._index)  # pylint: disable=protected-access
+        for name in self.columns:
+            column = getattr(self, name)
+            setattr(table, name, array("i", [column[idx] for idx in indexes]))
+        return table
+
+    def sort(self, key: Optional[Callable[[Error], Any]] = None):
+        """Sort the errors in place.
+
+        By default errors are sorted by filename, line and column without creating any
+        `Error` objects.
+        """
+        if key is None:
+            strings, filenames, lnums, cols = self.strings, self.filenames, self.lnums, self.cols
+            order = sorted(
+                range(len(self)), key=lambda n: (strings[filenames[n]], lnums[n], cols[n])
+            )
+        else:
+            order = sorted(range(len(self)), key=lambda n: key(self.get(n)))  # type: ignore
+        self._reorder(order)
+
+    def filter(self, predicate: Callable[[Error], bool]) -> ErrorTable:
+        """Get a new table with the errors which match the given predicate."""
+        return self.take([idx for idx, err in enumerate(self) if predicate(err)])
+
+    def remove_duplicates(self):
+        """Drop duplicates reported by different linters (see `remove_duplicates`)."""
+        strings, keep = self.strings, []
+        passed: DefaultDict[Tuple[int, int], Set] = defaultdict(set)
+        for idx in range(len(self)):
+            key = strings[self.sources[idx]], strings[self.numbers[idx]]
+            if key in DUPLICATES:
+                line = self.filenames[idx], self.lnums[idx]
+                if key in passed[line]:
+                    continue
+                passed[line] = DUPLICATES[key]
+            keep.append(idx)
+
+        if len(keep) < len(self):
+            self._reorder(keep)
+
+    def iter_dicts(self) -> Iterator[Dict[str, Any]]:
+        """Iterate through the errors as dicts (see `Error.to_dict`)."""
+        strings = self.strings
+        for idx in range(len(self)):
+            yield {
+                "source": strings[self.sources[idx]],
+                "col": self.cols[idx],
+                "lnum": self.lnums[idx],
+                "etype": strings[self.etypes[idx]],
+                "message": strings[self.messages[idx]],
+                "filename": strings[self.filenames[idx]],
+                "number": strings[self.numbers[idx]],
+            }
+
+    def _reorder(self, order: List[int]):
+        for name in self.columns:
+            column = getattr(self, name)
+            setattr(self, name, array("i", [column[idx] for idx in order]))
+
+
 # pylama:ignore=W0622,D,R0924
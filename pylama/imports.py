@@ -0,0 +1,116 @@
+"""Find files which import other files."""
+
+import ast
+import json
+import os
+from collections import defaultdict
+from os import path as op
+from pathlib import Path
+from typing import DefaultDict, Dict, Iterable, List, Optional, Set
+
+from pylama.config import LOGGER, Namespace
+from pylama.utils import get_cache_dir, read
+
+
+class ImportGraph:
+    """Imports of files, cached by the files' modification times and sizes."""
+
+    def __init__(self, path: Optional[Path] = None):
+        """Load the imports from the given file."""
+        self.path = path
+        self.values: Dict[str, list] = {}
+        if path and path.is_file():
+            try:
+                self.values = json.loads(path.read_text())
+            except ValueError:
+                LOGGER.info("Invalid imports file: %s", path)
+
+    @classmethod
+    def from_options(cls, options: Optional[Namespace]) -> "ImportGraph":
+        """Load the imports from the cache directory."""
+        cache_dir = get_cache_dir(options)
+        return cls(cache_dir and cache_dir / "imports.json")
+
+    def save(self):
+        """Save the imports."""
+        if self.path:
+            try:
+                self.path.write_text(json.dumps(self.values))
+            except OSError as exc:
+                LOGGER.info("Can't save imports: %s", exc)
+
+    def get_imports(self, path: str) -> List[str]:
+        """Get names of the modules which the given file imports."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return []
+
+        key = [stat.st_mtime_ns, stat.st_size]
+        cached = self.values.get(path)
+        if cached and cached[:2] == key:
+            return cached[2]
+
+        imports = sorted(parse_imports(path))
+        self.values[path] = [*key, imports]
+        return imports
+
+    def get_dependents(self, paths: Iterable[str], changed: Set[str]) -> Set[str]:
+        """Get the given paths which import the changed files (directly or not)."""
+        modules = {get_module_name(path): path for path in paths}
+        importers: DefaultDict[str, Set[str]] = defaultdict(set)
+        for path in modules.values():
+            for name in self.get_imports(path):
+                if name in modules:
+                    importers[modules[name]].add(path)
+
+        dependents: Set[str] = set()
+        queue = [path for path in changed if path in importers]
+        while queue:
+            for path in importers[queue.pop()]:
+                if path not in dependents and path not in changed:
+                    dependents.add(path)
+                    queue.append(path)
+
+        return dependents
+
+
+def get_module_name(path: str) -> str:
+    """Get a module name for the given file by its packages (directories with `__init__`)."""
+    directory, name = op.split(op.splitext(path)[0])
+    parts = [] if name == "__init__" else [name]
+    while op.isfile(op.join(directory, "__init__.py")):
+        directory, name = op.split(directory)
+        parts.insert(0, name)
+    return ".".join(parts)
+
+
+def parse_imports(path: str) -> Set[str]:
+    """Get names of the modules (and the names imported from them) from the given file.
+
+    Relative imports are resolved by the file's packages.
+    """
+    try:
+        tree = ast.parse(read(path))
+    except (SyntaxError, ValueError, OSError, UnicodeDecodeError):
+        return set()
+
+    package = get_module_name(path).split(".")
+    if op.basename(path) != "__init__.py":
+        package = package[:-1]
+
+    names: Set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                parts = package[: len(package) - node.level + 1]
+                base = ".".join(parts + ([base] if base else []))
+            if base:
+                names.add(base)
+            names.update(f"{base}.{alias.name}".lstrip(".") for alias in node.names)
+
+    return names
@@ -5,7 +5,8 @@ from argparse import ArgumentParser
 from importlib import import_module
 from pathlib import Path
 from pkgutil import walk_packages
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Type
 
 from pkg_resources import iter_entry_points
 
@@ -21,6 +22,7 @@ class LinterMeta(type):
     def __new__(mcs, name, bases, params):
         """Register linters."""
         cls: Type[LinterV2] = super().__new__(mcs, name, bases, params)
+        cls.lock = Lock()
         if cls.name is not None:
             LINTERS[cls.name] = cls
         return cls
@@ -31,6 +33,41 @@ class Linter(metaclass=LinterMeta):
 
     name: Optional[str] = None
 
+    #: Guards linters which are not thread-safe (every linter class gets its own lock)
+    lock: Lock
+
+    #: The linter doesn't share any mutable state between checks, so it can be run in
+    #: multiple threads at once
+    thread_safe: bool = False
+
+    #: Cost tier: 0 - cheap linters, 1 - expensive ones (see `--tiered`)
+    tier: int = 0
+
+    #: The linter spends most of its time waiting (subprocesses, I/O), so it can be run in
+    #: threads effectively
+    io_bound: bool = False
+
+    #: Relative cost of checking a file (used to estimate durations of unknown files)
+    cost: float = 1.0
+
+    #: The linter checks many files at once (see `LinterV2.run_batch`)
+    batch: bool = False
+
+    #: Results for a file depend on the files it imports (see `--changed-dependents`)
+    cross_file: bool = False
+
+    #: Prefixes of the error codes the linter emits (an empty tuple means it isn't known).
+    #: A linter is skipped when all its codes are ignored.
+    codes: Tuple[str, ...] = ()
+
+    #: Resources the linter uses. The context releases parsed resources once none of the
+    #: remaining linters needs them, legacy linters which don't need a real file get the
+    #: original path instead of a temporary file.
+    needs_file: bool = True
+    needs_ast: bool = False
+    needs_lines: bool = False
+    needs_tokens: bool = False
+
     @classmethod
     def add_args(cls, _: ArgumentParser):
         """Add options from linters.
@@ -46,9 +83,25 @@ class Linter(metaclass=LinterMeta):
 class LinterV2(Linter):
     """A new linter class."""
 
+    needs_file = False
+    needs_ast = True
+    needs_lines = True
+    needs_tokens = True
+
     def run_check(self, ctx: RunContext):
         """Check code."""
 
+    def run_batch(self, contexts: List[RunContext]):
+        """Check the given contexts at once.
+
+        The method is called for linters with `batch = True` with all the checked files.
+        Errors are pushed to the contexts, so noqa marks and select/ignore are applied per
+        file. By default every context is checked separately.
+        """
+        for ctx in contexts:
+            with ctx:
+                self.run_check(ctx)
+
 
 # Import default linters
 for _, pname, _ in walk_packages([str(Path(__file__).parent)]):  # type: ignore
@@ -10,6 +10,9 @@ class Linter(Abstract):
     """Run commented-out code checking."""
 
     name = "eradicate"
+    thread_safe = True
+    codes = ("E800",)
+    needs_ast = needs_lines = needs_tokens = False
 
     def run_check(self, ctx: RunContext):
         """Eradicate code checking.
@@ -12,6 +12,9 @@ class Linter(Abstract):
     """Run complexity checking."""
 
     name = "mccabe"
+    thread_safe = True
+    codes = ("C901",)
+    needs_lines = needs_tokens = False
 
     @classmethod
     def add_args(cls, parser: ArgumentParser):
@@ -30,10 +33,11 @@ class Linter(Abstract):
         if options:
             params.setdefault("max-complexity", options.max_complexity)
 
-        McCabeChecker.max_complexity = int(params.get("max-complexity", 10))
-        McCabeChecker._error_tmpl = "%r is too complex (%d)"
-        number = McCabeChecker._code
-        for lineno, offset, text, _ in McCabeChecker(ctx.ast, ctx.filename).run():
+        checker = McCabeChecker(ctx.ast, ctx.filename)
+        checker.max_complexity = int(params.get("max-complexity", 10))
+        checker._error_tmpl = "%r is too complex (%d)"
+        number = checker._code
+        for lineno, offset, text, _ in checker.run():
             ctx.push(
                 col=offset + 1,
                 lnum=lineno,
@@ -14,11 +14,16 @@ class Linter(Abstract):
     """MyPy runner."""
 
     name = "mypy"
+    tier = 1
+    cost = 20.0
+    cross_file = True
+    needs_ast = needs_lines = needs_tokens = False
 
     def run_check(self, ctx: RunContext):
         """Check code with mypy."""
-        # Support stdin
-        args = [ctx.temp_filename, "--follow-imports=skip", "--show-column-numbers"]
+        # Code from stdin is passed in memory
+        args = ["-c", ctx.source] if ctx.from_stdin else [ctx.filename]
+        args += ["--follow-imports=skip", "--show-column-numbers"]
         stdout, _, _ = api.run(args)  # noqa
 
         for line in stdout.splitlines():
@@ -1,5 +1,5 @@
 """pycodestyle support."""
-from pycodestyle import BaseReport, Checker, StyleGuide, get_parser
+from pycodestyle import DEFAULT_IGNORE, BaseReport, Checker, StyleGuide, get_parser
 
 from pylama.context import RunContext
 from pylama.lint import LinterV2 as Abstract
@@ -9,14 +9,23 @@ class Linter(Abstract):
     """pycodestyle runner."""
 
     name = "pycodestyle"
+    thread_safe = True
+    codes = ("E", "W")
+    needs_ast = needs_tokens = False
 
     def run_check(self, ctx: RunContext):  # noqa
         """Check code with pycodestyle."""
-        params = ctx.get_params("pycodestyle")
+        params = dict(ctx.get_params("pycodestyle"))
         options = ctx.options
         if options:
             params.setdefault("max_line_length", options.max_line_length)
 
+        # Disable ignored checks in pycodestyle itself (its default ignores are kept)
+        if "ignore" not in params and "select" not in params:
+            disabled = ctx.get_disabled("pycodestyle", self.codes)
+            if disabled:
+                params["ignore"] = disabled | set(DEFAULT_IGNORE.split(","))
+
         if params:
             parser = get_parser()
             for option in parser.option_list:
@@ -1,6 +1,7 @@
 """pydocstyle support."""
 
 from argparse import ArgumentParser
+from typing import Collection, Optional
 
 from pydocstyle import ConventionChecker as PyDocChecker
 from pydocstyle.violations import conventions
@@ -8,11 +9,54 @@ from pydocstyle.violations import conventions
 from pylama.context import RunContext
 from pylama.lint import LinterV2 as Abstract
 
+#: Codes which pydocstyle checks can emit
+CHECKS = {
+    "check_docstring_missing": ("D10",),
+    "check_docstring_empty": ("D419",),
+    "check_one_liners": ("D200",),
+    "check_no_blank_before": ("D201", "D202"),
+    "check_blank_before_after_class": ("D203", "D204", "D211"),
+    "check_blank_after_summary": ("D205",),
+    "check_indent": ("D206", "D207", "D208"),
+    "check_newline_after_last_paragraph": ("D209",),
+    "check_surrounding_whitespaces": ("D210",),
+    "check_multi_line_summary_start": ("D212", "D213"),
+    "check_triple_double_quotes": ("D300",),
+    "check_backslashes": ("D301",),
+    "check_ends_with_period": ("D400",),
+    "check_imperative_mood": ("D401",),
+    "check_no_signature": ("D402",),
+    "check_capitalized": ("D403",),
+    "check_starts_with_this": ("D404",),
+    "check_ends_with_punctuation": ("D415",),
+    "check_if_needed": ("D418",),
+    "check_docstring_sections": (
+        "D214",
+        "D215",
+        "D405",
+        "D406",
+        "D407",
+        "D408",
+        "D409",
+        "D410",
+        "D411",
+        "D412",
+        "D413",
+        "D414",
+        "D416",
+        "D417",
+    ),
+}
+
 
 class Linter(Abstract):
     """Check pydocstyle errors."""
 
     name = "pydocstyle"
+    thread_safe = True
+    cost = 2.0
+    codes = ("D",)
+    needs_ast = needs_lines = needs_tokens = False
 
     @classmethod
     def add_args(cls, parser: ArgumentParser):
@@ -30,13 +74,14 @@ class Linter(Abstract):
         if options and options.pydocstyle_convention:
             params.setdefault("convention", options.pydocstyle_convention)
         convention_codes = conventions.get(params.get("convention"))
-        for err in PyDocChecker().check_source(
+        checker = _Checker(tuple(ctx.get_disabled("pydocstyle", self.codes)), convention_codes)
+        for err in checker.check_source(
             ctx.source,
             ctx.filename,
             params.get("ignore_decorators"),
             params.get("ignore_inline_noqa", False),
         ):
-            if convention_codes is None or err.code in convention_codes:
+            if checker.is_reported(err.code):
                 ctx.push(
                     lnum=err.line,
                     text=err.short_desc,
@@ -44,3 +89,49 @@ class Linter(Abstract):
                     number=err.code,
                     source="pydocstyle",
                 )
+
+
+class _Checker(PyDocChecker):
+    """Run only the checks which codes aren't disabled."""
+
+    def __init__(self, disabled: tuple, convention_codes: Optional[Collection[str]] = None):
+        self.disabled = disabled
+        self.convention_codes = convention_codes
+
+    @property
+    def checks(self):
+        """Filter the checks by the catalog (unknown checks are always run).
+
+        Terminal checks (missing and empty docstrings) are always run: they stop the other
+        checks of a definition, which fail on blank docstrings. Their errors are filtered
+        with `is_reported`.
+        """
+        checks = [
+            check
+            for check in vars(PyDocChecker).values()
+            if hasattr(check, "_check_for")
+            and (check._terminal or not self.is_disabled(check.__name__))
+        ]
+        return sorted(checks, key=lambda check: not check._terminal)
+
+    def is_reported(self, code: str) -> bool:
+        """Check that the given code is neither disabled nor out of the convention."""
+        if self.convention_codes is not None and code not in self.convention_codes:
+            return False
+        return not code.startswith(self.disabled)
+
+    def is_disabled(self, name: str) -> bool:
+        """Check that all codes of the given check are disabled."""
+        codes = CHECKS.get(name)
+        if not codes:
+            return False
+
+        if self.convention_codes is not None and not any(
+            code.startswith(codes) for code in self.convention_codes
+        ):
+            return True
+
+        return all(code.startswith(self.disabled) for code in codes)
+
+
+#  pylama:ignore=W0212
@@ -34,6 +34,9 @@ class Linter(Abstract):
     """Pyflakes runner."""
 
     name = "pyflakes"
+    thread_safe = True
+    # Codes aren't declared: messages which are missing in CODES have no number
+    needs_lines = needs_tokens = False
 
     def run_check(self, context: RunContext):  # noqa
         """Check code with pyflakes."""
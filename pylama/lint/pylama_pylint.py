@@ -1,12 +1,15 @@
 """Pylint integration to Pylama."""
 import logging
 from argparse import ArgumentParser
+from functools import lru_cache
 from os import environ
+from os import path as op
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterable, Set, Tuple
 
+from astroid import MANAGER
 from pylint.interfaces import CONFIDENCE_LEVELS
-from pylint.lint import Run
+from pylint.lint import PyLinter, Run
 from pylint.reporters import BaseReporter
 
 from pylama.context import RunContext
@@ -14,6 +17,11 @@ from pylama.lint import LinterV2 as BaseLinter
 
 HOME_RCFILE = Path(environ.get("HOME", "")) / ".pylintrc"
 
+#: Configured pylint linters by their params (every process keeps its own ones, so
+#: astroid's caches stay warm between files)
+PYLINTERS: Dict[Tuple, Tuple[PyLinter, "Reporter"]] = {}
+PYLINTERS_MAX = 16
+
 
 logger = logging.getLogger("pylama")
 
@@ -22,6 +30,11 @@ class Linter(BaseLinter):
     """Check code with Pylint."""
 
     name = "pylint"
+    tier = 1
+    cost = 20.0
+    cross_file = True
+    codes = ("C", "E", "F", "I", "R", "W")
+    needs_ast = needs_lines = needs_tokens = False
 
     @classmethod
     def add_args(cls, parser: ArgumentParser):
@@ -41,34 +54,112 @@ class Linter(BaseLinter):
             params.setdefault("max_line_length", options.max_line_length)
             params.setdefault("confidence", options.pylint_confidence)
 
-        params.setdefault("enable", ctx.select | ctx.get_filter("pylint", "select"))
-        params.setdefault("disable", ctx.ignore | ctx.get_filter("pylint", "ignore"))
+        select = expand_codes(ctx.select | ctx.get_filter("pylint", "select"))
+        params.setdefault("enable", select)
+        params.setdefault(
+            "disable",
+            {
+                msgid
+                for msgid in expand_codes(ctx.ignore | ctx.get_filter("pylint", "ignore"))
+                if not msgid.startswith(tuple(select))
+            },
+        )
         # if params.get("disable"):
         #     params["disable"].add("W0012")
 
-        class Reporter(BaseReporter):
-            """Handle messages."""
+        logger.debug(params)
+
+        # Sources are given to pylint in memory, a file is written only for code from stdin
+        # which has no file on the disk
+        path = ctx.filename
+        if ctx.from_stdin and not op.isfile(path):
+            path = ctx.temp_filename
+
+        key = tuple(sorted((name, _Params.prepare_value(value)) for name, value in params.items()))
+        cached = PYLINTERS.get(key)
+        if cached is None:
+            reporter = Reporter(ctx)
+            args = _Params(params).to_attrs()
+            linter = _Run([path] + args, reporter=reporter, exit=False).linter
+            if len(PYLINTERS) >= PYLINTERS_MAX:
+                PYLINTERS.pop(next(iter(PYLINTERS)))
+            PYLINTERS[key] = linter, reporter
+            return
+
+        linter, reporter = cached
+        reporter.ctx = ctx
+        forget_module(path)
+        linter.check([path])
+
+
+class Reporter(BaseReporter):
+    """Push pylint's messages to the current context."""
+
+    def __init__(self, ctx: RunContext):
+        """Initialize the reporter."""
+        super().__init__()
+        self.ctx = ctx
+
+    def _display(self, _):
+        pass
+
+    def handle_message(self, msg):
+        """Push the message."""
+        msg_id = msg.msg_id
+        self.ctx.push(
+            filtrate=False,
+            col=msg.column + 1,
+            lnum=msg.line,
+            number=msg_id,
+            text=msg.msg,
+            type=msg_id[0],
+            source="pylint",
+        )
 
-            def _display(self, _):
-                pass
 
-            def handle_message(self, msg):
-                msg_id = msg.msg_id
-                ctx.push(
-                    filtrate=False,
-                    col=msg.column + 1,
-                    lnum=msg.line,
-                    number=msg_id,
-                    text=msg.msg,
-                    type=msg_id[0],
-                    source="pylint",
-                )
+class _PyLinter(PyLinter):
+    """Take sources from the current context instead of reading the files."""
 
-        logger.debug(params)
+    def get_ast(self, filepath, modname, data=None):
+        """Build an AST from the context's source."""
+        ctx = getattr(self.reporter, "ctx", None)
+        if data is None and ctx is not None and op.abspath(filepath) == op.abspath(ctx.filename):
+            data = ctx.source
+        return super().get_ast(filepath, modname, data)
+
+
+class _Run(Run):
+    LinterClass = _PyLinter
 
-        reporter = Reporter()
-        args = _Params(params).to_attrs()
-        Run([ctx.temp_filename] + args, reporter=reporter, exit=False)
+
+def forget_module(path: str):
+    """Remove the module of the given file from astroid's cache (the file can be changed)."""
+    path = op.abspath(path)
+    cache = MANAGER.astroid_cache
+    for name in [name for name, module in cache.items() if module.file == path]:
+        del cache[name]
+
+
+@lru_cache(None)
+def get_message_ids() -> Tuple[str, ...]:
+    """Get ids of the messages which pylint's default checkers emit."""
+    linter = PyLinter()
+    linter.load_default_plugins()
+    return tuple(sorted(msg.msgid for msg in linter.msgs_store.messages))
+
+
+def expand_codes(codes: Iterable[str]) -> Set[str]:
+    """Expand code prefixes to pylint's message ids.
+
+    Pylint doesn't support prefixes, checkers which messages are all disabled aren't run.
+    Unknown codes and symbolic names are kept as is.
+    """
+    msgids = get_message_ids()
+    result = set()
+    for code in codes:
+        matched = [msgid for msgid in msgids if msgid.startswith(code)]
+        result.update(matched or [code])
+    return result
 
 
 class _Params:
@@ -93,7 +184,10 @@ class _Params:
     @staticmethod
     def prepare_value(value):
         """Prepare value to pylint."""
-        if isinstance(value, (list, tuple, set)):
+        if isinstance(value, set):
+            return ",".join(sorted(value))
+
+        if isinstance(value, (list, tuple)):
             return ",".join(value)
 
         if isinstance(value, bool):
@@ -16,6 +16,9 @@ class Linter(Abstract):
     """Radon runner."""
 
     name = "radon"
+    thread_safe = True
+    codes = ("R901",)
+    needs_ast = needs_lines = needs_tokens = False
 
     @classmethod
     def add_args(cls, parser: ArgumentParser):
@@ -1,5 +1,8 @@
 """Support Vulture."""
 from argparse import ArgumentParser
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
 
 from vulture.core import ERROR_CODES, Vulture, make_config
 
@@ -11,6 +14,13 @@ class Linter(BaseLinter):
     """vulture runner."""
 
     name = "vulture"
+    tier = 1
+    thread_safe = True
+    batch = True
+    cost = 2.0
+    cross_file = True
+    codes = ("V",)
+    needs_ast = needs_lines = needs_tokens = False
 
     @classmethod
     def add_args(cls, parser: ArgumentParser):
@@ -31,32 +41,62 @@ class Linter(BaseLinter):
 
     def run_check(self, ctx: RunContext):  # noqa
         """Check code with vulture."""
-        params = ctx.get_params("vulture")
-        options = ctx.options
-        if options:
-            params.setdefault("min-confidence", options.vulture_min_confidence)
-            params.setdefault("ignore-names", options.vulture_ignore_names)
-            params.setdefault("ignore-decorators", options.vulture_ignore_decorators)
-
-        config = make_config(parse_params(ctx.filename, params))
-        vulture = Vulture(
-            verbose=config["verbose"],
-            ignore_names=config["ignore_names"],
-            ignore_decorators=config["ignore_decorators"],
-        )
+        check([ctx], get_params(ctx))
+
+    def run_batch(self, contexts: List[RunContext]):
+        """Scan all the files with one vulture instance to find usages across modules.
+
+        Files with different params are scanned separately.
+        """
+        groups: Dict[Tuple, List[RunContext]] = defaultdict(list)
+        params = {}
+        for ctx in contexts:
+            ctx_params = get_params(ctx)
+            key = tuple(sorted((name, str(value)) for name, value in ctx_params.items()))
+            groups[key].append(ctx)
+            params[key] = ctx_params
+
+        for key, group in groups.items():
+            check(group, params[key])
+
+
+def get_params(ctx: RunContext) -> Dict:
+    """Get vulture's params for the given context."""
+    params = ctx.get_params("vulture")
+    options = ctx.options
+    if options:
+        params.setdefault("min-confidence", options.vulture_min_confidence)
+        params.setdefault("ignore-names", options.vulture_ignore_names)
+        params.setdefault("ignore-decorators", options.vulture_ignore_decorators)
+    return params
+
+
+def check(contexts: List[RunContext], params: Dict):
+    """Scan the given contexts and push unused code to them."""
+    config = make_config(parse_params(contexts[0].filename, params))
+    vulture = Vulture(
+        verbose=config["verbose"],
+        ignore_names=config["ignore_names"],
+        ignore_decorators=config["ignore_decorators"],
+    )
+    for ctx in contexts:
         vulture.scan(ctx.source, filename=ctx.filename)
-        unused_code_items = vulture.get_unused_code(
-            min_confidence=config["min_confidence"], sort_by_size=config["sort_by_size"]
+
+    by_path = {Path(ctx.filename): ctx for ctx in contexts}
+    unused_code_items = vulture.get_unused_code(
+        min_confidence=config["min_confidence"], sort_by_size=config["sort_by_size"]
+    )
+    for item in unused_code_items:
+        item_ctx = by_path.get(Path(item.filename))
+        if item_ctx is None:
+            continue
+        item_ctx.push(
+            source="vulture",
+            type="R",
+            lnum=item.first_lineno,
+            number=ERROR_CODES[item.typ],
+            text=f"{item.message} ({item.confidence}% confidence)",
         )
-        for item in unused_code_items:
-            error_code = ERROR_CODES[item.typ]
-            ctx.push(
-                source="vulture",
-                type="R",
-                lnum=item.first_lineno,
-                number=error_code,
-                text=f"{item.message} ({item.confidence}% confidence)",
-            )
 
 
 def parse_params(path, params=None):
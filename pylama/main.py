@@ -2,24 +2,22 @@
 
 import sys
 import warnings
-from json import dumps
+from collections import defaultdict
+from copy import copy
 from os import path as op
 from os import walk
 from pathlib import Path
-from typing import List, Optional
-
-from pylama.check_async import check_async
-from pylama.config import CURDIR, Namespace, parse_options, setup_logger
-from pylama.core import LOGGER, run
-from pylama.errors import Error
+from typing import DefaultDict, Dict, Generator, Iterable, Iterator, List, Optional, Sequence, Set
+
+from pylama.cache import ResultCache
+from pylama.check_async import iter_async, plan
+from pylama.config import CURDIR, Namespace, get_dir_options, parse_options, setup_logger
+from pylama.core import LOGGER, run, run_batch
+from pylama.errors import Error, ErrorTable, remove_duplicates
+from pylama.lint import LINTERS
+from pylama.output import DEFAULT_FORMAT, MESSAGE_FORMATS, STREAMING_FORMATS, get_writer  # noqa
 from pylama.utils import read_stdin
-
-DEFAULT_FORMAT = "{filename}:{lnum}:{col} [{etype}] {number} {message} [{source}]"
-MESSAGE_FORMATS = {
-    "pylint": "{filename}:{lnum}: [{etype}] {number} {message} [{source}]",
-    "pycodestyle": "{filename}:{lnum}:{col} {number} {message} [{source}]",
-    "parsable": DEFAULT_FORMAT,
-}
+from pylama.vcs import filter_changed, get_index_files
 
 
 def check_paths(
@@ -30,44 +28,258 @@ def check_paths(
 ) -> List[Error]:
     """Check the given paths.
 
+    Errors are returned as a list (`iter_errors` yields them file by file).
+
     :param rootdir: Root directory (for making relative file paths)
     :param options: Parsed pylama options (from pylama.config.parse_options)
     """
-    paths = paths or options.paths
-    if not paths:
-        return []
+    errors: List[Error] = []
+    for file_errors in iter_errors(paths, options, code=code, rootdir=rootdir):
+        errors += file_errors
 
-    if code is None:
-        candidates = []
-        for path in paths or options.paths:
-            if not op.exists(path):
-                continue
+    return errors
+
+
+def iter_errors(
+    paths: Optional[List[str]],
+    options: Namespace,
+    code: str = None,
+    rootdir: Path = None,
+    sources: Dict[str, str] = None,
+) -> Iterator[Sequence[Error]]:
+    """Check the given paths and yield errors file by file, as soon as they are ready.
 
-            if not op.isdir(path):
-                candidates.append(op.abspath(path))
+    With `--max-errors` checking stops (and pending checks are cancelled) when enough
+    errors are found.
 
-            for root, _, files in walk(path):
-                candidates += [op.relpath(op.join(root, f), CURDIR) for f in files]
+    :param sources: Sources to check from memory by their paths (the paths aren't read)
+    """
+    paths = list(sources) if sources else paths or options.paths
+    if not paths:
+        return
+
+    keys = None
+    if sources:
+        candidates = paths
+    elif code is None:
+        if options.discovery == "git":
+            keys = get_index_files(paths)
+        candidates = get_candidates(paths) if keys is None else list(keys)
+        if options.changed_since:
+            candidates = filter_changed(candidates, options)
     else:
         candidates = [paths[0]]
 
     if not candidates:
-        return []
+        return
 
     if rootdir is None:
         path = candidates[0]
         rootdir = Path(path if op.isdir(path) else op.dirname(path))
 
-    candidates = [path for path in candidates if path.endswith(".py")]
+    # Sources from memory are checked whatever their names are
+    if not sources:
+        candidates = [path for path in candidates if path.endswith(".py")]
+
+    cache = ResultCache.from_options(options) if keys else None
+    if cache is not None:
+        results = iter_cached(candidates, keys or {}, cache, options, rootdir)
+    else:
+        results = iter_checks(candidates, options, code, rootdir, sources)
+
+    if not options.max_errors:
+        yield from results
+        return
 
-    if options.concurrent:
-        return check_async(candidates, code=code, options=options, rootdir=rootdir)
+    limit = options.max_errors
+    for file_errors in results:
+        if len(file_errors) >= limit:
+            LOGGER.info("Stop checking: %d errors found", options.max_errors)
+            yield file_errors[:limit]
+            results.close()
+            return
 
-    errors = []
+        limit -= len(file_errors)
+        yield file_errors
+
+
+def iter_checks(
+    candidates: List[str],
+    options: Namespace,
+    code: str = None,
+    rootdir: Path = None,
+    sources: Dict[str, str] = None,
+) -> Generator[Sequence[Error], None, None]:
+    """Check the candidates (by tiers with `--tiered`)."""
+    if options.tiered:
+        return iter_tiers(candidates, options, code, rootdir, sources)
+    return iter_candidates(candidates, options, code, rootdir, sources)
+
+
+def iter_cached(
+    candidates: List[str],
+    keys: Dict[str, str],
+    cache: ResultCache,
+    options: Namespace,
+    rootdir: Path = None,
+) -> Generator[Sequence[Error], None, None]:
+    """Yield cached errors of unchanged files, check the others and cache their errors.
+
+    The results are saved only when all the files have been checked.
+    """
+    rootdir = rootdir or CURDIR
+    filenames = {path: get_filename(path, rootdir, options) for path in candidates}
+    keys = {
+        path: cache.get_key(keys.get(path, ""), get_dir_options(options, path, rootdir))
+        for path in candidates
+    }
+    misses = []
     for path in candidates:
-        errors += run(path=path, code=code, rootdir=rootdir, options=options)
+        errors = cache.get(path, keys.get(path, ""), filenames[path])
+        if errors is None:
+            misses.append(path)
+        else:
+            yield errors
 
-    return errors
+    LOGGER.info("Cached results: %d files", len(candidates) - len(misses))
+    found: DefaultDict[str, List[Error]] = defaultdict(list)
+    for file_errors in iter_checks(misses, options, rootdir=rootdir):
+        for err in file_errors:
+            found[err.filename].append(err)
+        yield file_errors
+
+    for path in misses:
+        cache.set(path, keys.get(path, ""), found[filenames[path]])
+    cache.save()
+
+
+def get_filename(path: str, rootdir: Path, options: Namespace) -> str:
+    """Get a filename which is reported for the given path (see `core.run`)."""
+    filename = op.relpath(path, rootdir)
+    return op.abspath(filename) if options.abspath else filename
+
+
+def get_candidates(paths: List[str]) -> List[str]:
+    """Get files to check from the given paths (directories are walked)."""
+    candidates = []
+    for path in paths:
+        if not op.exists(path):
+            continue
+
+        if not op.isdir(path):
+            candidates.append(op.abspath(path))
+
+        for root, _, files in walk(path):
+            candidates += [op.relpath(op.join(root, f), CURDIR) for f in files]
+
+    return candidates
+
+
+def iter_candidates(
+    candidates: List[str],
+    options: Namespace,
+    code: str = None,
+    rootdir: Path = CURDIR,
+    sources: Dict[str, str] = None,
+) -> Generator[Sequence[Error], None, None]:
+    """Check the given files.
+
+    Batch linters (see `LinterV2.run_batch`) check all the files at once when the other
+    linters are done. Duplicates are removed across the runs.
+    """
+    batch = {
+        name
+        for name in options.linters or LINTERS
+        if name in LINTERS
+        and LINTERS[name].batch
+        and options.tier in (None, LINTERS[name].tier)
+    }
+    if not batch:
+        yield from iter_files(candidates, options, code, rootdir, sources)
+        return
+
+    file_options = copy(options)
+    file_options.batch_linters = batch
+    passed: DefaultDict[str, DefaultDict[int, Set]] = defaultdict(lambda: defaultdict(set))
+    yield from iter_unique(
+        iter_files(candidates, file_options, code, rootdir, sources), passed
+    )
+
+    LOGGER.info("Run batch linters: %s", ", ".join(sorted(batch)))
+    yield from iter_unique(
+        run_batch(candidates, batch, code, rootdir, options, sources=sources), passed
+    )
+
+
+def iter_files(
+    candidates: List[str],
+    options: Namespace,
+    code: str = None,
+    rootdir: Path = CURDIR,
+    sources: Dict[str, str] = None,
+) -> Generator[Sequence[Error], None, None]:
+    """Check the given files with the planned executor (see `check_async.plan`)."""
+    sizes = None
+    if sources:
+        sizes = {path: len(source) for path, source in sources.items()}
+    executor, jobs = plan(candidates, options, sizes)
+    if executor != "serial":
+        yield from iter_async(
+            candidates,
+            code=code,
+            options=options,
+            rootdir=rootdir,
+            executor=executor,
+            jobs=jobs,
+            sources=sources,
+            ordered=options.format not in STREAMING_FORMATS,
+        )
+        return
+
+    for path in candidates:
+        if sources:
+            code = sources[path]
+        yield run(path=path, code=code, rootdir=rootdir, options=options)
+
+
+def iter_tiers(
+    candidates: List[str],
+    options: Namespace,
+    code: str = None,
+    rootdir: Path = CURDIR,
+    sources: Dict[str, str] = None,
+) -> Generator[Sequence[Error], None, None]:
+    """Check the given files tier by tier: cheap linters over all the files go first.
+
+    Duplicates are removed across the tiers. With `--tiered-skip-failed` files which have
+    errors are not checked by the next tiers.
+    """
+    linters = [LINTERS[name] for name in options.linters or LINTERS if name in LINTERS]
+    passed: DefaultDict[str, DefaultDict[int, Set]] = defaultdict(lambda: defaultdict(set))
+    for tier in sorted({linter.tier for linter in linters}):
+        tier_options = copy(options)
+        tier_options.tier = tier
+        if options.tiered_skip_failed and passed:
+            candidates = [
+                path
+                for path in candidates
+                if op.relpath(path, rootdir) not in passed and op.abspath(path) not in passed
+            ]
+
+        LOGGER.info("Run linters of tier %d", tier)
+        yield from iter_unique(
+            iter_candidates(candidates, tier_options, code, rootdir, sources), passed
+        )
+
+
+def iter_unique(
+    results: Iterable[Sequence[Error]], passed: DefaultDict[str, DefaultDict[int, Set]]
+) -> Iterator[Sequence[Error]]:
+    """Remove errors which have been already found in the files (see `remove_duplicates`)."""
+    for file_errors in results:
+        if file_errors:
+            file_errors = list(remove_duplicates(file_errors, passed[file_errors[0].filename]))
+        yield file_errors
 
 
 def check_path(
@@ -97,6 +309,11 @@ def shell(args: List[str] = None, error: bool = True):
     if args is None:
         args = sys.argv[1:]
 
+    if args[:1] == ["serve"]:
+        from .server import serve  # noqa
+
+        return serve(args[1:])
+
     options = parse_options(args)
     setup_logger(options)
     LOGGER.info(options)
@@ -108,33 +325,43 @@ def shell(args: List[str] = None, error: bool = True):
         for path in options.paths:
             return install_hook(path)
 
+    if options.stdin_protocol:
+        from .protocol import serve_ndjson  # noqa
+
+        total = serve_ndjson(sys.stdin, sys.stdout, options, rootdir=CURDIR)
+        if error:
+            sys.exit(int(bool(total)))
+        return total
+
     if options.from_stdin and not options.paths:
         LOGGER.error("--from-stdin requires a filename")
         return sys.exit(1)
 
-    errors = check_paths(
-        options.paths,
-        code=read_stdin() if options.from_stdin else None,
-        options=options,
-        rootdir=CURDIR,
-    )
-    display_errors(errors, options)
+    # Errors are kept only to be returned, otherwise they are just counted
+    errors = None if error else ErrorTable()
+    total = 0
+    with get_writer(options) as writer:
+        for file_errors in iter_errors(
+            options.paths,
+            code=read_stdin() if options.from_stdin else None,
+            options=options,
+            rootdir=CURDIR,
+        ):
+            writer.write(file_errors)
+            total += len(file_errors)
+            if errors is not None:
+                errors += file_errors
 
     if error:
-        sys.exit(int(bool(errors)))
+        sys.exit(int(bool(total)))
 
     return errors
 
 
-def display_errors(errors: List[Error], options: Namespace):
+def display_errors(errors: Iterable[Error], options: Namespace):
     """Format and display the given errors."""
-    if options.format == "json":
-        LOGGER.warning(dumps([err.to_dict() for err in errors]))
-
-    else:
-        pattern = MESSAGE_FORMATS.get(options.format, DEFAULT_FORMAT)
-        for err in errors:
-            LOGGER.warning(err.format(pattern))
+    with get_writer(options) as writer:
+        writer.write(errors)
 
 
 if __name__ == "__main__":
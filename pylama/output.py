@@ -0,0 +1,251 @@
+"""Format and write errors."""
+
+import sys
+from functools import lru_cache
+from json import dumps
+from operator import attrgetter
+from string import Formatter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Type
+
+from pylama import __version__
+from pylama.config import Namespace
+from pylama.errors import Error, ErrorTable
+
+DEFAULT_FORMAT = "{filename}:{lnum}:{col} [{etype}] {number} {message} [{source}]"
+MESSAGE_FORMATS = {
+    "pylint": "{filename}:{lnum}: [{etype}] {number} {message} [{source}]",
+    "pycodestyle": "{filename}:{lnum}:{col} {number} {message} [{source}]",
+    "parsable": DEFAULT_FORMAT,
+}
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+#: How many formatted lines are kept in memory before they are written
+BUFFER_LINES = 4096
+
+#: Formats which report files as soon as they are checked (not in the order of the files)
+STREAMING_FORMATS = {"jsonl", "sarif"}
+
+
+@lru_cache(None)
+def compile_format(pattern: str) -> Callable[[Error], str]:
+    """Compile the given pattern to a function which formats an error.
+
+    Named fields are replaced by positional ones and the values are taken from an error
+    with a single `attrgetter` call.
+    """
+    template, fields = "", []  # type: str, List[str]
+    for literal, field, spec, conversion in Formatter().parse(pattern):
+        template += literal.replace("{", "{{").replace("}", "}}")
+        if field is None:
+            continue
+        template += "{%d%s%s}" % (  # noqa
+            len(fields),
+            f"!{conversion}" if conversion else "",
+            f":{spec}" if spec else "",
+        )
+        fields.append(field)
+
+    if not fields:
+        return lambda _: template.format()
+
+    fmt = template.format
+    getter = attrgetter(*fields)
+    if len(fields) == 1:
+        return lambda err: fmt(getter(err))
+
+    return lambda err: fmt(*getter(err))
+
+
+def iter_dicts(errors: Iterable[Error]) -> Iterator[Dict[str, Any]]:
+    """Convert the given errors to dicts, tables are converted without creating errors."""
+    if isinstance(errors, ErrorTable):
+        return errors.iter_dicts()
+    return (err.to_dict() for err in errors)
+
+
+class Writer:
+    """Write formatted errors to a stream with buffering."""
+
+    def __init__(self, stream: TextIO, pattern: str = DEFAULT_FORMAT, close: bool = False):
+        """Initialize the writer."""
+        self.stream = stream
+        self.formatter = compile_format(pattern)
+        self.buffer: List[str] = []
+        self._close = close
+
+    def __enter__(self):
+        """Enter to context."""
+        return self
+
+    def __exit__(self, *_):
+        """Flush the buffer and close the stream."""
+        self.close()
+
+    def write(self, errors: Iterable[Error]):
+        """Write the given errors."""
+        self.buffer.extend(self.format(errors))
+        if len(self.buffer) >= BUFFER_LINES:
+            self.flush()
+
+    def format(self, errors: Iterable[Error]) -> Iterable[str]:
+        """Format the given errors."""
+        return map(self.formatter, errors)
+
+    def flush(self):
+        """Write the buffer to the stream."""
+        if self.buffer:
+            lines, self.buffer = self.buffer, []
+            lines.append("")
+            self.stream.write("\n".join(lines))
+        self.stream.flush()
+
+    def close(self):
+        """Flush the buffer and release the stream."""
+        self.flush()
+        if self._close:
+            self.stream.close()
+
+
+class JSONWriter(Writer):
+    """Write errors as a JSON array, item by item."""
+
+    separator = ", "
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the writer."""
+        super().__init__(*args, **kwargs)
+        self.started = False
+
+    def format(self, errors: Iterable[Error]) -> Iterable[str]:
+        """Serialize the given errors."""
+        return map(dumps, iter_dicts(errors))
+
+    def flush(self):
+        """Write the buffered items to the stream."""
+        if self.buffer:
+            items, self.buffer = self.buffer, []
+            prefix = self.separator if self.started else self.get_opening()
+            self.started = True
+            self.stream.write(prefix + self.separator.join(items))
+        self.stream.flush()
+
+    def close(self):
+        """Finish the document."""
+        self.flush()
+        if not self.started:
+            self.stream.write(self.get_opening())
+        self.stream.write(self.get_closing())
+        super().close()
+
+    def get_opening(self) -> str:
+        """Get a string which starts the document."""
+        return "["
+
+    def get_closing(self) -> str:
+        """Get a string which finishes the document."""
+        return "]\n"
+
+
+class JSONLinesWriter(Writer):
+    """Write errors as JSON objects, one per line.
+
+    The buffer is flushed on every write, so results are available as soon as each file is
+    checked.
+    """
+
+    format = JSONWriter.format
+
+    def write(self, errors: Iterable[Error]):
+        """Write the given errors and flush them."""
+        super().write(errors)
+        self.flush()
+
+
+class SARIFWriter(JSONWriter):
+    """Write errors as a SARIF log.
+
+    Results are streamed as they come, rules are collected along the way and are written to
+    the end of the document.
+    """
+
+    levels = {"E": "error", "F": "error", "W": "warning"}
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the writer."""
+        super().__init__(*args, **kwargs)
+        self.rules: Dict[str, Dict[str, Any]] = {}
+
+    def format(self, errors: Iterable[Error]) -> Iterable[str]:
+        """Convert the given errors to SARIF results."""
+        return map(self.format_result, iter_dicts(errors))
+
+    def format_result(self, info: Dict[str, Any]) -> str:
+        """Convert the given error's info to a SARIF result."""
+        rule_id = info["number"] or info["source"]
+        rule = self.rules.get(rule_id)
+        if rule is None:
+            rule = self.rules[rule_id] = {
+                "id": rule_id,
+                "shortDescription": {"text": info["message"]},
+                "properties": {"tags": []},
+            }
+        if info["source"] not in rule["properties"]["tags"]:
+            rule["properties"]["tags"].append(info["source"])
+
+        return dumps(
+            {
+                "ruleId": rule_id,
+                "level": self.levels.get(info["etype"], "note"),
+                "message": {"text": info["message"]},
+                "locations": [
+                    {
+                        "physicalLocation": {
+                            "artifactLocation": {"uri": info["filename"]},
+                            "region": {"startLine": info["lnum"], "startColumn": info["col"]},
+                        }
+                    }
+                ],
+            }
+        )
+
+    def get_opening(self) -> str:
+        """Start the SARIF log and the results list."""
+        return f'{{"version": "2.1.0", "$schema": "{SARIF_SCHEMA}", "runs": [{{"results": ['
+
+    def get_closing(self) -> str:
+        """Finish the results and describe the tool with the collected rules."""
+        driver = {
+            "name": "pylama",
+            "version": __version__,
+            "informationUri": "https://github.com/klen/pylama",
+            "rules": list(self.rules.values()),
+        }
+        return f'], "tool": {dumps({"driver": driver})}}}]}}\n'
+
+
+WRITERS: Dict[str, Type[Writer]] = {
+    "json": JSONWriter,
+    "jsonl": JSONLinesWriter,
+    "sarif": SARIFWriter,
+}
+
+
+def get_writer(options: Namespace, stream: Optional[TextIO] = None) -> Writer:
+    """Get a writer for the given options.
+
+    Errors are written to the given stream, to a report file or to stdout.
+    """
+    writer_cls = WRITERS.get(options.format, Writer)
+    pattern = MESSAGE_FORMATS.get(options.format, DEFAULT_FORMAT)
+    if stream is not None:
+        return writer_cls(stream, pattern)
+
+    if options.report:
+        return writer_cls(
+            open(options.report, "w", encoding="utf-8"),  # noqa
+            pattern,
+            close=True,
+        )
+
+    return writer_cls(sys.stdout, pattern)
@@ -0,0 +1,59 @@
+"""Check sources streamed through stdin (see `--stdin-protocol`)."""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, TextIO
+
+from pylama.api import Session
+from pylama.config import CURDIR, LOGGER, Namespace
+from pylama.output import iter_dicts
+
+
+def serve_ndjson(
+    lines: Iterable[str], stream: TextIO, options: Namespace, rootdir: Path = CURDIR
+) -> int:
+    """Check NDJSON records and write results as soon as each record is checked.
+
+    Every line is an object `{"path": ..., "source": ...}` (an optional "id" is sent back
+    as is). For every record a line `{"path": ..., "errors": [...]}` is written (or
+    `{"path": ..., "error": ...}` for invalid records and failed checks, they don't stop
+    the stream). Linters are kept warm between records.
+
+    :return: A number of found errors
+    """
+    session = Session(options, rootdir=rootdir)
+    total = 0
+    for line in lines:
+        if not line.strip():
+            continue
+
+        result: Dict[str, Any] = {}
+        try:
+            record = json.loads(line)
+            if "id" in record:
+                result["id"] = record["id"]
+            result["path"] = path = record["path"]
+            source = record["source"]
+            if not isinstance(path, str) or not isinstance(source, str):
+                raise TypeError("path and source have to be strings")
+            if not path.endswith(".py"):
+                raise ValueError("path has to be a python file's path")
+
+        except (ValueError, TypeError, KeyError) as exc:
+            LOGGER.info("Invalid record: %r", line)
+            result["error"] = f"Invalid record: {exc!r}"
+
+        else:
+            try:
+                errors = session.check_source(path, source)
+            except Exception as exc:  # noqa
+                LOGGER.exception("Can't check %s", path)
+                result["error"] = f"Check failed: {exc!r}"
+            else:
+                result["errors"] = list(iter_dicts(errors))
+                total += len(errors)
+
+        stream.write(json.dumps(result) + "\n")
+        stream.flush()
+
+    return total
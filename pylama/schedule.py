@@ -0,0 +1,117 @@
+"""Order and group files for concurrent checking."""
+
+import json
+import os.path as op
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from pylama.config import LOGGER, Namespace
+from pylama.lint import LINTERS
+from pylama.utils import get_cache_dir
+
+#: Estimated seconds per a byte of source for files without recorded durations (for a
+#: linter of cost 1, see `Linter.cost`)
+DEFAULT_BYTE_COST = 3e-6
+
+#: How many chunks are prepared for each worker (more chunks -- better balance)
+CHUNKS_PER_JOB = 4
+
+
+class Durations:
+    """Per-file check durations persisted between runs."""
+
+    def __init__(self, path: Optional[Path] = None, weight: float = 1.0):
+        """Load durations from the given file.
+
+        :param weight: A total cost of the linters which are run
+        """
+        self.path = path
+        self.weight = weight
+        self.values: Dict[str, float] = {}
+        if path and path.is_file():
+            try:
+                self.values = json.loads(path.read_text())
+            except ValueError:
+                LOGGER.info("Invalid durations file: %s", path)
+
+    @classmethod
+    def from_options(cls, options: Optional[Namespace]) -> "Durations":
+        """Load durations from the cache directory."""
+        cache_dir = get_cache_dir(options)
+        weight = 1.0
+        if options:
+            weight = sum(LINTERS[name].cost for name in options.linters if name in LINTERS)
+        return cls(cache_dir and cache_dir / "durations.json", weight or 1.0)
+
+    def update(self, path: str, duration: float):
+        """Record a duration for the given path."""
+        self.values[path] = round(duration, 4)
+
+    def save(self):
+        """Save the durations."""
+        if self.path:
+            try:
+                self.path.write_text(json.dumps(self.values))
+            except OSError as exc:
+                LOGGER.info("Can't save durations: %s", exc)
+
+    def estimate(
+        self, paths: List[str], sizes: Optional[Dict[str, int]] = None
+    ) -> Dict[str, float]:
+        """Estimate check duration for the given paths.
+
+        Unknown files are estimated by their size with the average cost of a byte from the
+        recorded files (or by the linters' costs when there are no recorded files).
+
+        :param sizes: Sizes of sources which are checked from memory
+        """
+        sizes = {path: _size(path) for path in paths} if sizes is None else sizes
+        known = [path for path in paths if path in self.values and sizes[path]]
+        byte_cost = DEFAULT_BYTE_COST * self.weight
+        if known:
+            byte_cost = sum(self.values[path] for path in known) / sum(
+                sizes[path] for path in known
+            )
+
+        return {path: self.values.get(path, sizes[path] * byte_cost) for path in paths}
+
+
+def schedule(
+    paths: List[str], durations: Durations, jobs: int, sizes: Optional[Dict[str, int]] = None
+) -> List[List[str]]:
+    """Group the given paths into chunks, the longest expected chunks go first.
+
+    Expensive files get their own chunks, small files are packed together to reduce per-task
+    overhead.
+    """
+    if not paths:
+        return []
+
+    costs = durations.estimate(paths, sizes)
+    target = sum(costs.values()) / (max(jobs, 1) * CHUNKS_PER_JOB)
+
+    chunks: List[List[str]] = []
+    chunk: List[str] = []
+    chunk_cost = 0.0
+    for path in sorted(paths, key=costs.__getitem__, reverse=True):
+        if costs[path] >= target:
+            chunks.append([path])
+            continue
+
+        chunk.append(path)
+        chunk_cost += costs[path]
+        if chunk_cost >= target:
+            chunks.append(chunk)
+            chunk, chunk_cost = [], 0.0
+
+    if chunk:
+        chunks.append(chunk)
+
+    return chunks
+
+
+def _size(path: str) -> int:
+    try:
+        return op.getsize(path)
+    except OSError:
+        return 0
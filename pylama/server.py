@@ -0,0 +1,367 @@
+"""Check code on a local HTTP server (see `pylama serve`).
+
+The server keeps a pool of warm workers (linters are instantiated once per worker) and
+accepts requests with paths and sources:
+
+    POST /check  {"paths": ["pkg"], "sources": [{"path": "gen/a.py", "source": "..."}]}
+    GET /metrics
+
+Requests are admitted while there are free slots (running and queued requests), the
+others are rejected with 503, so the clients can retry later.
+"""
+
+import json
+import os
+import socketserver
+import stat
+import sys
+import threading
+import time
+from argparse import ArgumentParser
+from concurrent.futures import BrokenExecutor, Executor, Future
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from os import path as op
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from pylama.api import Session
+from pylama.check_async import CPU_COUNT, EXECUTORS
+from pylama.config import CURDIR, LOGGER, Namespace, parse_options, setup_logger
+from pylama.main import get_candidates
+from pylama.output import iter_dicts
+
+#: Default TCP port
+PORT = 8765
+
+#: How many requests may wait for workers (per a worker)
+QUEUE_SIZE = 4
+
+#: Maximum size of a request body
+MAX_BODY = 64 * 2 ** 20
+
+STATE = threading.local()
+
+
+def init_worker(options: Namespace, rootdir: Path):
+    """Prepare a session for the current worker."""
+    STATE.session = Session(options, rootdir=rootdir)
+
+
+def check_item(path: str, source: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Check the given file (or source) with the worker's session."""
+    session: Session = STATE.session
+    if source is None:
+        return list(iter_dicts(session.check_file(path)))
+    return list(iter_dicts(session.check_source(path, source)))
+
+
+class Metrics:
+    """Count requests, checked files and latencies."""
+
+    def __init__(self):
+        """Initialize the counters."""
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.requests = self.rejected = self.failed = self.running = 0
+        self.files = self.errors = 0
+        self.latency_total = self.latency_max = 0.0
+
+    def admit(self):
+        """Count a new request."""
+        with self.lock:
+            self.running += 1
+
+    def reject(self):
+        """Count a rejected request."""
+        with self.lock:
+            self.rejected += 1
+
+    def observe(self, files: int, errors: int, latency: float, failed: bool = False):
+        """Count a finished request."""
+        with self.lock:
+            self.running -= 1
+            self.requests += 1
+            self.failed += failed
+            self.files += files
+            self.errors += errors
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the current values."""
+        with self.lock:
+            uptime = time.monotonic() - self.started
+            return {
+                "uptime": round(uptime, 3),
+                "requests": self.requests,
+                "rejected": self.rejected,
+                "failed": self.failed,
+                "running": self.running,
+                "files": self.files,
+                "errors": self.errors,
+                "requests_per_second": round(self.requests / uptime, 3),
+                "files_per_second": round(self.files / uptime, 3),
+                "latency": {
+                    "total": round(self.latency_total, 3),
+                    "max": round(self.latency_max, 3),
+                    "avg": round(self.latency_total / self.requests, 3) if self.requests else 0,
+                },
+            }
+
+
+class LintService:
+    """Run checks on a warm worker pool with a bounded queue."""
+
+    def __init__(
+        self,
+        options: Namespace,
+        rootdir: Path = CURDIR,
+        jobs: int = None,
+        queue_size: int = None,
+    ):
+        """Start the workers.
+
+        Pylint can't be run in processes (see `parse_options`), so the workers are
+        threads when it's enabled.
+        """
+        self.jobs = jobs or options.jobs or CPU_COUNT
+        self.executor = "thread" if "pylint" in options.linters else "process"
+        self.options = options
+        self.rootdir = rootdir
+        self.lock = threading.Lock()
+        self.pool = self.start_pool()
+        self.slots = threading.BoundedSemaphore(
+            self.jobs * (1 + QUEUE_SIZE) if queue_size is None else self.jobs + queue_size
+        )
+        self.metrics = Metrics()
+
+    def start_pool(self) -> Executor:
+        """Start the workers."""
+        pool = EXECUTORS[self.executor](
+            self.jobs, initializer=init_worker, initargs=(self.options, self.rootdir)
+        )
+        LOGGER.info("Started %d %s workers", self.jobs, self.executor)
+        return pool
+
+    def restart_pool(self, pool: Executor):
+        """Replace the given broken pool (once for all the requests which have used it)."""
+        with self.lock:
+            if self.pool is pool:
+                LOGGER.warning("The workers are broken, restart them")
+                self.pool = self.start_pool()
+        pool.shutdown(wait=False)
+
+    def check(self, request: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Check the requested paths and sources.
+
+        :raises OverflowError: When the queue is full
+        :raises ValueError: When the request is invalid
+        :raises RuntimeError: When a worker fails
+        """
+        if not self.slots.acquire(blocking=False):
+            self.metrics.reject()
+            raise OverflowError("The queue is full")
+
+        self.metrics.admit()
+        started, files, errors, failed = time.perf_counter(), 0, 0, True
+        try:
+            items = self.get_items(request)
+            files = len(items)
+            results = self.run(items)
+            errors, failed = len(results), False
+            return results
+
+        finally:
+            self.slots.release()
+            self.metrics.observe(files, errors, time.perf_counter() - started, failed)
+
+    def get_items(self, request: Dict[str, Any]) -> List[Tuple[str, Optional[str]]]:
+        """Get the requested files (paths with sources to check instead of the files)."""
+        paths = request.get("paths") or []
+        sources = request.get("sources") or []
+        if not isinstance(paths, list) or not isinstance(sources, list):
+            raise ValueError("paths and sources have to be lists")
+
+        items: List[Tuple[str, Optional[str]]] = [
+            (path, None)
+            for path in get_candidates([str(path) for path in paths])
+            if path.endswith(".py")
+        ]
+        for item in sources:
+            if (
+                not isinstance(item, dict)
+                or not isinstance(item.get("source"), str)
+                or not isinstance(item.get("path"), str)
+                or not item["path"]
+            ):
+                raise ValueError("sources have to be objects with path and source")
+            items.append((item["path"], item["source"]))
+
+        return items
+
+    def run(self, items: List[Tuple[str, Optional[str]]]) -> List[Dict[str, Any]]:
+        """Check the files on the workers.
+
+        When a worker fails the other files are cancelled (and a broken pool is restarted).
+        """
+        pool = self.pool
+        futures: List[Future] = []
+        try:
+            futures.extend(pool.submit(check_item, path, source) for path, source in items)
+            return [err for future in futures for err in future.result()]
+
+        # Workers re-raise any exceptions of the linters
+        except Exception as exc:  # noqa
+            for future in futures:
+                future.cancel()
+            if isinstance(exc, BrokenExecutor):
+                self.restart_pool(pool)
+            raise RuntimeError(f"A worker has failed: {exc!r}") from exc
+
+    def close(self):
+        """Stop the workers."""
+        self.pool.shutdown()
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Handle lint requests."""
+
+    server: "ThreadingHTTPServer"
+
+    def do_GET(self):  # noqa
+        """Report the metrics."""
+        if self.path != "/metrics":
+            return self.respond(404, {"error": "Not found"})
+        return self.respond(200, self.server.service.metrics.to_dict())
+
+    def do_POST(self):  # noqa
+        """Check the requested paths and sources."""
+        if self.path != "/check":
+            return self.respond(404, {"error": "Not found"})
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            if length > MAX_BODY:
+                return self.respond(413, {"error": "The request is too large"})
+
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError("The request has to be an object")
+
+            errors = self.server.service.check(request)
+
+        except OverflowError as exc:
+            return self.respond(503, {"error": str(exc)}, {"Retry-After": "1"})
+
+        except ValueError as exc:
+            return self.respond(400, {"error": str(exc)})
+
+        except (RuntimeError, OSError) as exc:
+            LOGGER.exception("Can't check the request")
+            return self.respond(500, {"error": str(exc)})
+
+        return self.respond(200, {"errors": errors})
+
+    def respond(self, status: int, data: Dict[str, Any], headers: Dict[str, str] = None):
+        """Send a JSON response."""
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # noqa
+        """Log requests with pylama's logger."""
+        LOGGER.debug(format, *args)
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    """Handle requests in threads."""
+
+    daemon_threads = True
+    service: LintService
+
+
+if hasattr(socketserver, "UnixStreamServer"):
+
+    class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        """Handle requests from a Unix socket in threads."""
+
+        daemon_threads = True
+        service: LintService
+
+else:
+    UnixHTTPServer = None  # type: ignore
+
+
+def is_socket(path: str) -> bool:
+    """Check the given path is a Unix socket."""
+    try:
+        return stat.S_ISSOCK(os.stat(path).st_mode)
+    except OSError:
+        return False
+
+
+def make_server(service: LintService, port: int = PORT, unix_socket: str = None):
+    """Bind a server to localhost (or to the given Unix socket, a stale one is replaced).
+
+    :raises FileExistsError: When the socket's path is taken by another file
+    :raises OSError: When Unix sockets aren't supported
+    """
+    server: Any
+    if unix_socket:
+        if UnixHTTPServer is None:
+            raise OSError("Unix sockets aren't supported on this platform")
+        if is_socket(unix_socket):
+            os.unlink(unix_socket)
+        elif op.lexists(unix_socket):
+            raise FileExistsError(f"{unix_socket} exists and isn't a socket")
+        server = UnixHTTPServer(unix_socket, Handler)
+    else:
+        server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+
+    server.service = service
+    return server
+
+
+def setup_serve_parser() -> ArgumentParser:
+    """Create a parser for the server's arguments (other arguments are pylama options)."""
+    parser = ArgumentParser(prog="pylama serve", add_help=False)
+    parser.add_argument("--port", type=int, default=PORT, help="Port on localhost.")
+    parser.add_argument("--socket", help="Listen on the Unix socket instead of a port.")
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        help="How many requests may wait for workers before new ones are rejected "
+        f"(default: {QUEUE_SIZE} per a worker).",
+    )
+    return parser
+
+
+def serve(args: List[str]):
+    """Run the server until it's interrupted."""
+    params, args = setup_serve_parser().parse_known_args(args)
+    options = parse_options(args)
+    setup_logger(options)
+
+    service = LintService(options, queue_size=params.queue_size)
+    try:
+        server = make_server(service, params.port, params.socket)
+    except OSError as exc:
+        service.close()
+        LOGGER.error("Can't start the server: %s", exc)
+        sys.exit(1)
+
+    LOGGER.warning("Serving on %s", params.socket or f"http://127.0.0.1:{params.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if params.socket and is_socket(params.socket):
+            os.unlink(params.socket)
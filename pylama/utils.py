@@ -1,8 +1,11 @@
 """Pylama utils."""
 
+import os
+from argparse import Namespace
 from io import StringIO
-from sys import stdin
-from typing import List
+from pathlib import Path
+from sys import platform, stdin
+from typing import List, Optional
 
 
 def get_lines(value: str) -> List[str]:
@@ -20,3 +23,38 @@ def read_stdin() -> str:
     """Get value from stdin."""
     value = stdin.buffer.read()
     return value.decode("utf-8")
+
+
+def get_cache_dir(options: Optional[Namespace]) -> Optional[Path]:
+    """Get a directory for pylama's caches (create it when it's needed)."""
+    cache_dir = getattr(options, "cache_dir", None)
+    if not cache_dir:
+        return None
+
+    path = Path(cache_dir)
+    if not path.is_dir():
+        try:
+            path.mkdir(parents=True)
+            (path / ".gitignore").write_text("# Created by pylama automatically.\n*\n")
+        except OSError:
+            return None
+
+    return path
+
+
+def get_rss() -> int:
+    """Get memory usage (resident set size) of the current process in bytes."""
+    try:
+        with open("/proc/self/statm", encoding="utf-8") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        import resource  # noqa
+
+        # Peak usage, in bytes on macOS and in kilobytes on other systems
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss if platform == "darwin" else rss * 1024
+    except ImportError:
+        return 0
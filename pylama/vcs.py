@@ -0,0 +1,123 @@
+"""Select files with git."""
+
+import hashlib
+import os
+from os import path as op
+from subprocess import PIPE, run
+from typing import Dict, List, Optional, Set
+
+from pylama.config import LOGGER, Namespace
+from pylama.imports import ImportGraph
+from pylama.lint import LINTERS
+
+
+def git(*args: str, cwd: str = None) -> Optional[bytes]:
+    """Run a git command and get its output (None when the command fails)."""
+    try:
+        proc = run(["git", *args], stdout=PIPE, stderr=PIPE, cwd=cwd, check=False)
+    except OSError as exc:
+        LOGGER.warning("Can't run git: %s", exc)
+        return None
+
+    if proc.returncode:
+        LOGGER.warning("git %s: %s", args[0], proc.stderr.decode("utf-8", "replace").strip())
+        return None
+
+    return proc.stdout
+
+
+def get_index_files(paths: List[str]) -> Optional[Dict[str, str]]:
+    """Get files to check from the git index with their blob hashes (None when git fails).
+
+    Directories are listed with one `git ls-files -s` call instead of walking them, so
+    ignored and untracked files are skipped. The given files are kept as is (like
+    `get_candidates` does), untracked ones get empty hashes.
+    """
+    existing = [path for path in paths if op.exists(path)]
+    if not existing:
+        return {}
+
+    listed = git("ls-files", "-s", "-z", "--", *existing)
+    modified = git("ls-files", "-m", "-z", "--", *existing)
+    if listed is None or modified is None:
+        return None
+
+    index = parse_index(listed, modified)
+    files = {}
+    for path in existing:
+        if not op.isdir(path):
+            files[op.abspath(path)] = index.pop(op.normpath(path), "")
+
+    files.update((name, sha) for name, sha in index.items() if sha)
+    return files
+
+
+def parse_index(listed: bytes, modified: bytes) -> Dict[str, str]:
+    """Get blob hashes of files from `git ls-files -s -z` and `git ls-files -m -z` outputs.
+
+    Python files which are changed in the working tree (or unmerged) are hashed again.
+    """
+    index: Dict[str, str] = {}
+    for entry in os.fsdecode(listed).split("\0"):
+        if not entry:
+            continue
+        info, name = entry.split("\t", 1)
+        mode, sha, stage = info.split()
+        # Skip submodules
+        if mode != "160000":
+            index[op.normpath(name)] = sha if stage == "0" else ""
+
+    for name in os.fsdecode(modified).split("\0"):
+        name = op.normpath(name)
+        if name in index:
+            index[name] = ""
+
+    for name, sha in index.items():
+        if not sha and name.endswith(".py") and op.isfile(name):
+            index[name] = get_blob_hash(name)
+
+    return index
+
+
+def get_blob_hash(path: str) -> str:
+    """Hash the given file like git hashes blobs."""
+    with open(path, "rb") as file:
+        data = file.read()
+    return hashlib.sha1(b"blob %d\0%s" % (len(data), data)).hexdigest()  # noqa
+
+
+def get_changed_files(ref: str) -> Optional[Set[str]]:
+    """Get absolute paths of the files which have been changed since the given ref.
+
+    Committed and uncommitted changes of tracked files are included, deleted files aren't.
+    """
+    output = git("diff", "--name-only", "--relative", "--diff-filter=d", "-z", ref, "--")
+    if output is None:
+        return None
+
+    return {op.abspath(name) for name in output.decode("utf-8").split("\0") if name}
+
+
+def filter_changed(candidates: List[str], options: Namespace) -> List[str]:
+    """Keep the candidates which have been changed since `--changed-since`.
+
+    With `--changed-dependents` (and cross-file linters enabled) the candidates which import
+    the changed files (directly or not) are kept too. All the candidates are kept when git
+    can't tell the changes.
+    """
+    changed = get_changed_files(options.changed_since)
+    if changed is None:
+        return candidates
+
+    if options.changed_dependents and any(
+        LINTERS[name].cross_file for name in options.linters if name in LINTERS
+    ):
+        graph = ImportGraph.from_options(options)
+        changed |= graph.get_dependents(
+            [op.abspath(path) for path in candidates if path.endswith(".py")], changed
+        )
+        graph.save()
+
+    selected = [path for path in candidates if op.abspath(path) in changed]
+    LOGGER.info("Changed since %s: %d files", options.changed_since, len(selected))
+    return selected
@@ -0,0 +1,102 @@
+def test_check_sources(parse_options, tmp_path):
+    from pylama.api import check_sources
+
+    sources = [
+        ("pkg/a.py", "import os\n"),
+        ("pkg/b.py", "undefined()\n"),
+        ("pkg/c.py", "value = 1\n"),
+    ]
+    options = parse_options(linters="pyflakes", config=False)
+    results = list(check_sources(sources, options))
+    assert len(results) == 3
+    errors = {err.filename: err.number for file_errors in results for err in file_errors}
+    assert errors == {"pkg/a.py": "W0611", "pkg/b.py": "E0602"}
+
+    for executor in ("thread", "process"):
+        options = parse_options(
+            linters="pyflakes", config=False, executor=executor, cache_dir=str(tmp_path)
+        )
+        assert {
+            err.filename: err.number
+            for file_errors in check_sources(iter(sources), options)
+            for err in file_errors
+        } == errors
+
+    options = parse_options(linters="pyflakes", config=False, max_errors=1)
+    assert sum(len(file_errors) for file_errors in check_sources(sources, options)) == 1
+
+    assert not list(check_sources([], options))
+
+    # Sources are checked whatever their names are
+    results = list(check_sources([("snippet", "undefined()\n")], options))
+    assert [err.number for file_errors in results for err in file_errors] == ["E0602"]
+
+
+def test_session(parse_options):
+    import pylama
+    from pylama.api import Session
+
+    assert pylama.Session is Session
+
+    session = Session(parse_options(linters="pyflakes", config=False))
+    linter = session.linters["pyflakes"]
+
+    errors = session.check_source("snippet.py", "undefined()\n")
+    assert [err.number for err in errors] == ["E0602"]
+    assert session.check_source("snippet.py", "value = 1\n") == []
+    assert session.check_file("dummy.py")
+    assert session.linters["pyflakes"] is linter
+
+    results = list(session.check_many(["dummy.py", ("snippet.py", "import os\n")]))
+    assert len(results) == 2
+    assert results[1][0].number == "W0611"
+
+    results = list(session.check_many([("snippet", "import os\n")]))
+    assert results[0][0].number == "W0611"
+
+
+def test_async_api(parse_options, monkeypatch):
+    import asyncio
+    import time
+    from concurrent.futures import ProcessPoolExecutor
+
+    from pylama.api import check_paths_async, check_source_async
+    from pylama.lint import LINTERS, LinterV2
+
+    options = parse_options(linters="pyflakes", config=False)
+    errors = asyncio.run(check_source_async("snippet.py", "undefined()\n", options))
+    assert [err.number for err in errors] == ["E0602"]
+
+    errors = asyncio.run(check_paths_async(["dummy.py", "pylama/errors.py"], options))
+    assert errors
+    assert {err.filename for err in errors} == {"dummy.py"}
+
+    with ProcessPoolExecutor(2) as executor:
+        coro = check_paths_async(["dummy.py"], options, executor=executor)
+        assert len(asyncio.run(coro)) == len(errors)
+
+    checked = []
+
+    class SlowLinter(LinterV2):
+        thread_safe = True
+
+        def run_check(self, ctx):
+            checked.append(ctx.filename)
+            time.sleep(0.2)
+
+    monkeypatch.setitem(LINTERS, "slow", SlowLinter)
+    options = parse_options(linters="slow", config=False)
+
+    async def cancel():
+        paths = ["dummy.py", "pylama/errors.py", "pylama/core.py"]
+        task = asyncio.ensure_future(check_paths_async(paths, options, concurrency=1))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        await asyncio.sleep(0.3)
+
+    asyncio.run(cancel())
+    assert len(checked) == 1
@@ -31,3 +31,52 @@ def test_from_stdin(parse_options):
     assert options
     assert options.from_stdin is True
     assert options.paths
+
+
+def test_nearest_config(tmp_path, monkeypatch, parse_options, run):
+    from pathlib import Path
+
+    monkeypatch.chdir(tmp_path)
+    sub = Path("sub")
+    (sub / "deep").mkdir(parents=True)
+    (sub / "tests").mkdir()
+    (sub / "pylama.ini").write_text(
+        "[pylama]\nignore = W0611\n\n[pylama:tests/*]\nignore = E\n"
+    )
+    for path in (sub / "mod.py", sub / "deep" / "mod.py", Path("other.py")):
+        path.write_text("import os\n")
+    (sub / "tests" / "test_mod.py").write_text("undefined()\n")
+
+    def check(path, options):
+        return run(str(path), options=options, rootdir=Path("."))
+
+    options = parse_options(["--nearest-config", "-l", "pyflakes"])
+    assert [err.number for err in check("other.py", options)] == ["W0611"]
+    assert not check(sub / "mod.py", options)
+    assert not check(sub / "deep" / "mod.py", options)
+    assert not check(sub / "tests" / "test_mod.py", options)
+    resolved = options.dir_options[str(tmp_path / "sub")]
+    assert options.dir_options[str(tmp_path / "sub" / "deep")] is resolved
+    assert resolved.linters == ["pyflakes"]
+
+    # An explicit config is used for all the files
+    options = parse_options(["--nearest-config", "-l", "pyflakes", "-o", "sub/pylama.ini"])
+    assert check(sub / "tests" / "test_mod.py", options)
+
+
+def test_nearest_config_other_tools(tmp_path, monkeypatch, parse_options, run):
+    from pathlib import Path
+
+    monkeypatch.chdir(tmp_path)
+    inner = Path("sub") / "inner"
+    inner.mkdir(parents=True)
+    (inner.parent / "pylama.ini").write_text("[pylama]\nignore = W0611,E501\n")
+    (inner / "pyproject.toml").write_text("[tool.black]\nline-length = 100\n")
+    (inner / "setup.cfg").write_text("[flake8]\nmax-line-length = 100\n")
+    (inner / "mod.py").write_text("import os\n")
+
+    options = parse_options(["--nearest-config", "-l", "pyflakes"])
+    assert not run(str(inner / "mod.py"), options=options, rootdir=Path("."))
+    resolved = options.dir_options[str(tmp_path / "sub")]
+    assert options.dir_options[str(tmp_path / inner)] is resolved
+    assert resolved.options == (tmp_path / "sub" / "pylama.ini").as_posix()
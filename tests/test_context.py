@@ -88,3 +88,37 @@ def test_context_does_not_change_global_options(context, parse_args):
     assert options.linters == ["pylint"]
     assert options.select == {"W123"}
     assert options.ignore == {"W234"}
+
+
+def test_context_temp_filename():
+    from pathlib import Path
+
+    from pylama.context import RunContext, get_temp_dir
+
+    with RunContext("missing.py", "print(1)\n") as ctx:
+        path = Path(ctx.temp_filename)
+        assert ctx.from_stdin
+        assert str(path.parent) == get_temp_dir()
+        assert path.read_text() == "print(1)\n"
+
+    assert not path.exists()
+    assert path.parent.exists()
+
+    with RunContext("dummy.py") as ctx:
+        assert ctx.temp_filename == "dummy.py"
+
+
+def test_temp_dir_workers():
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    from pathlib import Path
+
+    from pylama.context import get_temp_dir
+
+    # Forked workers exit without running atexit callbacks
+    get_temp_dir.cache_clear()
+    with ProcessPoolExecutor(2, mp_context=multiprocessing.get_context("fork")) as pool:
+        paths = {Path(pool.submit(get_temp_dir).result()) for _ in range(4)}
+        assert all(path.is_dir() for path in paths)
+
+    assert not any(path.exists() for path in paths)
@@ -21,6 +21,10 @@ def test_checkpath(parse_options):
     assert result
     assert result[0].filename == "dummy.py"
 
+    # Errors are returned as a list
+    assert result + [] == result
+    assert check_paths(["unknown.py"], options) == []
+
 
 def test_run_with_code(run, parse_options):
     options = parse_options(linters="pyflakes")
@@ -28,10 +32,10 @@ def test_run_with_code(run, parse_options):
     assert errors
 
 
-def test_async(parse_options):
+def test_async(parse_options, tmp_path):
     from pylama.check_async import check_async
 
-    options = parse_options(config=False)
+    options = parse_options(config=False, cache_dir=str(tmp_path))
     errors = check_async(["dummy.py"], options=options, rootdir=".")
     assert errors
 
@@ -41,3 +45,282 @@ def test_errors():
 
     err = Error(col=0)
     assert err.col == 1
+
+
+def test_iter_errors(parse_options):
+    from pylama.main import iter_errors
+
+    options = parse_options(["dummy.py", "pylama/errors.py"], config=False)
+    results = list(iter_errors(None, options))
+    assert len(results) == 2
+    assert results[0]
+    assert all(err.filename == "dummy.py" for err in results[0])
+
+
+def test_error_table():
+    from pylama.errors import Error, ErrorTable
+
+    errors = [
+        Error(source="pylint", text="C0321", filename="b.py", lnum=2),
+        Error(source="pycodestyle", text="E701", filename="b.py", lnum=2),
+        Error(source="pycodestyle", text="E701", filename="a.py", lnum=2),
+        Error(source="pyflakes", text="W0611", filename="a.py", lnum=1, col=3),
+    ]
+    table = ErrorTable(errors)
+    assert len(table) == 4
+    assert table[-1].to_dict() == errors[-1].to_dict()
+    assert [err.number for err in table[1:3]] == ["E701", "E701"]
+    assert len(table.strings) < 4 * 5
+
+    table.sort()
+    assert [(err.filename, err.lnum) for err in table] == [
+        ("a.py", 1), ("a.py", 2), ("b.py", 2), ("b.py", 2)
+    ]
+
+    table.remove_duplicates()
+    assert len(table) == 3
+
+    merged = ErrorTable([Error(text="E001", filename="c.py")])
+    merged += table
+    assert len(merged) == 4
+    assert list(merged.iter_dicts()) == [err.to_dict() for err in merged]
+
+    warnings = merged.filter(lambda err: err.number.startswith("W"))
+    assert [err.filename for err in warnings] == ["a.py"]
+
+
+def test_error_table_pack():
+    import pickle
+
+    from pylama.errors import Error, ErrorTable
+
+    table = ErrorTable([Error(text="E001 first", filename="a.py", lnum=n) for n in range(1, 100)])
+    unpacked = ErrorTable.unpack(table.pack())
+    assert list(unpacked.iter_dicts()) == list(table.iter_dicts())
+
+    unpickled = pickle.loads(pickle.dumps(table))
+    assert len(unpickled) == 99
+    assert unpickled[98].lnum == 99
+    assert len(pickle.dumps(table)) < len(pickle.dumps(list(table)))
+
+
+def test_plan(parse_options, monkeypatch, tmp_path):
+    from pylama.check_async import plan
+    from pylama.lint import LINTERS, LinterV2
+
+    options = parse_options(["--concurrent", "--jobs=4"], config=False, cache_dir="")
+    assert options.executor == "auto"
+    assert plan(["dummy.py"], options) == ("serial", 1)
+
+    big = tmp_path / "big.py"
+    big.write_text("#" * 10 ** 6)
+    paths = [str(big)] * 8
+    assert plan(paths, options) == ("process", 4)
+
+    class IOLinter(LinterV2):
+        io_bound = True
+        thread_safe = True
+
+    monkeypatch.setitem(LINTERS, "io", IOLinter)
+    options.linters = ["io"]
+    assert plan(paths, options) == ("thread", 4)
+
+    options = parse_options(["--executor=thread"], config=False, cache_dir=str(tmp_path))
+    assert plan(["dummy.py"] * 3, options)[0] == "thread"
+    assert parse_options(["--executor=process", "-l", "pylint"]).executor == "serial"
+
+    from pylama.main import check_paths
+
+    options = parse_options(
+        ["--executor=thread", "dummy.py", "pylama/errors.py"], config=False, cache_dir=str(tmp_path)
+    )
+    assert check_paths(None, options)
+
+
+def test_async_recycle(parse_options):
+    from pylama.check_async import iter_async
+    from pylama.utils import get_rss
+
+    assert get_rss() > 0
+
+    paths = ["dummy.py", "pylama/errors.py", "pylama/core.py", "pylama/main.py"]
+    options = parse_options(config=False, cache_dir="")
+    expected = sorted(len(res) for res in iter_async(paths, options=options, jobs=2))
+
+    options = parse_options(config=False, cache_dir="", max_files_per_worker=1)
+    assert sorted(len(res) for res in iter_async(paths, options=options, jobs=2)) == expected
+
+    options = parse_options(config=False, cache_dir="", max_worker_rss=1)
+    assert sorted(len(res) for res in iter_async(paths, options=options, jobs=2)) == expected
+
+
+def test_async_order(parse_options, monkeypatch):
+    import time
+
+    from pylama.check_async import iter_async
+    from pylama.errors import Error
+
+    def run(path, **params):
+        time.sleep(0.2 if path == "a.py" else 0)
+        return [Error(filename=path, text="E001 error")]
+
+    monkeypatch.setattr("pylama.check_async.run", run)
+    paths = ["a.py", "b.py", "c.py", "d.py"]
+    options = parse_options(config=False, cache_dir="")
+
+    def check(**params):
+        results = iter_async(paths, options=options, executor="thread", jobs=2, **params)
+        return [res[0].filename for res in results]
+
+    assert check() == paths
+    unordered = check(ordered=False)
+    assert sorted(unordered) == paths
+    assert unordered[0] != "a.py"
+
+
+def test_timeouts(parse_options, run, monkeypatch):
+    import time
+
+    from pylama.lint import LINTERS, LinterV2
+
+    class SlowLinter(LinterV2):
+        thread_safe = True
+
+        def run_check(self, ctx):
+            ctx.push(text="started", number="W001", source="slow")
+            time.sleep(5)
+
+    monkeypatch.setitem(LINTERS, "slow", SlowLinter)
+
+    options = parse_options(linters="slow,pyflakes", config=False, timeout_per_file=0.2)
+    errors = run("dummy.py", code="undefined()", options=options)
+    timeouts = [err for err in errors if err.number == "E002"]
+    assert len(timeouts) == 1
+    assert "checking took more than 0.2s" in timeouts[0].message
+
+    options = parse_options(linters="slow,pyflakes", config=False)
+    options.linters_params["slow"] = {"timeout": "0.1"}
+    errors = run("dummy.py", code="undefined()", options=options)
+    assert {err.number for err in errors} == {"W001", "E002", "E0602"}
+    (timeout,) = [err for err in errors if err.number == "E002"]
+    assert "slow took more than 0.1s" in timeout.message
+
+
+def test_max_errors(parse_options, run, tmp_path):
+    from pylama.main import check_paths
+
+    paths = ["dummy.py", "pylama/errors.py", "pylama/core.py", "pylama/main.py"]
+    options = parse_options(paths, config=False, cache_dir="")
+    options.max_line_length = 40
+    expected = sum(len(run(path, options=options)) for path in paths)
+    assert expected > len(paths)
+    assert len(check_paths(None, options)) == expected
+
+    options = parse_options(paths + ["--fail-fast"], config=False, cache_dir="")
+    assert options.max_errors == 1
+    assert len(check_paths(None, options)) == 1
+
+    options = parse_options(paths + ["--max-errors=3"], config=False, cache_dir="")
+    options.linters = ["pycodestyle", "pyflakes", "mccabe"]
+    assert len(check_paths(None, options)) == 3
+
+    options = parse_options(
+        paths + ["--max-errors=2", "--executor=process"], config=False, cache_dir=str(tmp_path)
+    )
+    assert len(check_paths(None, options)) == 2
+
+
+def test_tiered(parse_options, monkeypatch):
+    from pylama.lint import LINTERS, LinterV2
+    from pylama.main import iter_errors
+
+    class Expensive(LinterV2):
+        tier = 1
+
+        def run_check(self, ctx):
+            # Duplicates pyflakes' W0611 and adds a new error
+            ctx.push(source="pylint", number="W0611", text="unused import", lnum=1)
+            ctx.push(source="pylint", number="C0000", text="expensive", lnum=1)
+
+    monkeypatch.setitem(LINTERS, "expensive", Expensive)
+
+    options = parse_options(["--tiered", "-l", "pyflakes,expensive"], config=False)
+    code = "import os\n"
+    results = [list(errors) for errors in iter_errors(["dummy.py"], options, code=code)]
+    assert [[err.number for err in errors] for errors in results] == [["W0611"], ["C0000"]]
+
+    options.tiered_skip_failed = True
+    results = [list(errors) for errors in iter_errors(["dummy.py"], options, code=code)]
+    assert [[err.number for err in errors] for errors in results] == [["W0611"]]
+
+
+def test_linter_capabilities(parse_options, run, context, monkeypatch):
+    from pylama.core import get_linters
+    from pylama.lint import LINTERS, Linter
+
+    options = parse_options(linters="pycodestyle,pyflakes,mccabe", ignore="E,W", config=False)
+    ctx = context(code="import os  # noqa\nundefined()\n", options=options)
+    assert sorted(name for name, _ in get_linters(ctx)) == ["mccabe", "pyflakes"]
+    ctx.select.add("W0611")
+    assert len(get_linters(ctx)) == 3
+
+    assert ctx.ast and ctx.lines and ctx.tokens
+    ctx.release([LINTERS["pyflakes"]])
+    assert ctx._ast is not None and ctx._lines is None and ctx._tokens is None
+    ctx.release([])
+    assert ctx._ast is None
+    ctx.push(lnum=1, text="unused", number="W0611")
+    ctx.push(lnum=2, text="complex", number="C901")
+    assert [err.lnum for err in ctx.errors] == [2]
+
+    paths = []
+
+    class LegacyLinter(Linter):
+        needs_file = False
+
+        def run(self, path, **_):
+            paths.append(path)
+            return []
+
+    monkeypatch.setitem(LINTERS, "legacy", LegacyLinter)
+    options = parse_options(linters="legacy", config=False)
+    run("filename.py", code="undefined()", options=options)
+    assert paths == ["filename.py"]
+
+
+def test_run_batch(parse_options, run, monkeypatch, tmp_path):
+    from pathlib import Path
+
+    from pylama.lint import LINTERS, LinterV2
+    from pylama.main import check_paths
+
+    batches = []
+
+    class BatchLinter(LinterV2):
+        batch = True
+
+        def run_check(self, ctx):
+            ctx.push(lnum=1, text="single", number="W001", source="batch")
+
+        def run_batch(self, contexts):
+            batches.append(sorted(ctx.filename for ctx in contexts))
+            for ctx in contexts:
+                ctx.push(lnum=1, text="batch", number="W001", source="batch")
+                ctx.push(lnum=2, text="batch", number="W002", source="batch")
+
+    monkeypatch.setitem(LINTERS, "batch", BatchLinter)
+    monkeypatch.chdir(tmp_path)
+
+    paths = []
+    for name, code in (("a.py", "a = 1\n"), ("b.py", "b = 1  # noqa\n"), ("c.py", "c = 1\n")):
+        (tmp_path / name).write_text(code)
+        paths.append(str(tmp_path / name))
+    (tmp_path / "c.py").write_text("# pylama:skip=1\n")
+
+    options = parse_options(linters="batch", ignore="W002", config=False, concurrent=True)
+    errors = check_paths(paths, options, rootdir=Path("."))
+    assert batches == [["a.py", "b.py"]]
+    assert [(err.filename, err.message) for err in errors] == [("a.py", "batch")]
+
+    errors = run("a.py", rootdir=Path("."), options=options)
+    assert [err.message for err in errors] == ["single"]
@@ -129,6 +129,24 @@ def test_mypy(context):
     # assert not errors[0]['text'].startswith(errors[0]['number'])
 
 
+def test_stdin_in_memory(context, monkeypatch):
+    from pylama.lint import LINTERS
+
+    def fail(*_, **__):
+        raise AssertionError("A temporary file is created")
+
+    monkeypatch.setattr("pylama.context.NamedTemporaryFile", fail)
+
+    ctx = context(code="import os\n", args="--select=W0611 --ignore=C dummy.py")
+    LINTERS["pylint"]().run_check(ctx)
+    assert [err.message for err in ctx.errors] == ["Unused import os"]
+
+    ctx = context(code="value: int = 'str'\n")
+    LINTERS["mypy"]().run_check(ctx)
+    assert ctx.errors
+    assert "Incompatible types" in ctx.errors[0].message
+
+
 def test_radon(context):
     from pylama.lint import LINTERS
 
@@ -192,6 +210,29 @@ def test_pylint(context):
     assert not errors
 
 
+def test_pylint_reuse(context):
+    from pylama.lint import LINTERS
+    from pylama.lint.pylama_pylint import PYLINTERS
+
+    pylint = LINTERS["pylint"]
+    PYLINTERS.clear()
+
+    ctx = context(code="import os\n", args="--select=W0611 --ignore=C dummy.py")
+    pylint().run_check(ctx)
+    assert [err.number for err in ctx.errors] == ["W0611"]
+    (cached,) = PYLINTERS.values()
+
+    ctx = context(code="import sys\n", args="--select=W0611 --ignore=C dummy.py")
+    pylint().run_check(ctx)
+    assert [err.message for err in ctx.errors] == ["Unused import sys"]
+    assert list(PYLINTERS.values()) == [cached]
+
+    ctx = context(code="import sys\n", args="--ignore=C,W dummy.py")
+    pylint().run_check(ctx)
+    assert not ctx.errors
+    assert len(PYLINTERS) == 2
+
+
 def test_quotes(source):
     from pylama.lint import LINTERS, Linter
 
@@ -220,3 +261,88 @@ def test_vulture(context):
     ctx = context(args="--vulture-min-confidence=80")
     vulture().run_check(ctx)
     assert not ctx.errors
+
+
+def test_vulture_batch(parse_options):
+    from pylama.context import RunContext
+    from pylama.lint import LINTERS
+
+    vulture = LINTERS["vulture"]
+    assert vulture.batch
+
+    options = parse_options(config=False)
+    lib = RunContext("lib.py", "def used():\n    pass\n\n\ndef unused():\n    pass\n", options)
+    app = RunContext("app.py", "from lib import used\n\nused()\n", options)
+    vulture().run_batch([lib, app])
+    assert [err.message for err in lib.errors] == ["unused function 'unused' (60% confidence)"]
+    assert not app.errors
+
+    lib.errors.clear()
+    vulture().run_check(lib)
+    assert len(lib.errors) == 2
+
+
+def test_thread_safety(context):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from pylama.lint import LINTERS
+
+    mccabe = LINTERS["mccabe"]
+    assert mccabe.thread_safe
+    assert not LINTERS["pylint"].thread_safe
+    assert mccabe.lock is not LINTERS["pylint"].lock
+
+    def check(complexity):
+        ctx = context(mccabe={"max-complexity": complexity})
+        mccabe().run_check(ctx)
+        return len(ctx.errors)
+
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(check, [1, 100] * 8))
+
+    assert results[0]
+    assert results == [results[0], 0] * 8
+
+
+def test_disabled_checks(context, monkeypatch):
+    from pycodestyle import StyleGuide
+
+    from pylama.lint import LINTERS
+    from pylama.lint.pylama_pydocstyle import _Checker
+    from pylama.lint.pylama_pylint import expand_codes
+
+    ctx = context(args="--ignore=E2,E3,W,D --select=E301 dummy.py")
+    assert ctx.get_disabled("pycodestyle", LINTERS["pycodestyle"].codes) == {"E2", "W"}
+
+    guides = []
+    monkeypatch.setattr(
+        "pylama.lint.pylama_pycodestyle.StyleGuide",
+        lambda **params: guides.append(StyleGuide(**params)) or guides[-1],
+    )
+    LINTERS["pycodestyle"]().run_check(ctx)
+    assert guides[0].ignore_code("E225") and guides[0].ignore_code("W291")
+    assert not guides[0].ignore_code("E501")
+    assert not any(err.number.startswith(("E2", "W")) for err in ctx.errors)
+
+    checks = {check.__name__ for check in _Checker(("D10", "D2")).checks}
+    assert "check_docstring_missing" in checks
+    assert "check_one_liners" not in checks
+    assert "check_ends_with_period" in checks
+    assert "check_docstring_sections" in checks
+    checks = {check.__name__ for check in _Checker((), {"D100", "D400"}).checks}
+    assert checks == {
+        "check_docstring_missing",
+        "check_docstring_empty",
+        "check_ends_with_period",
+    }
+
+    # Terminal checks are run, their errors are filtered
+    for args in ("--ignore=D419", "--ignore=D1,D419"):
+        ctx = context(code='"""Module."""\n\n\nclass _A:\n    """"""\n', args=f"{args} dummy.py")
+        LINTERS["pydocstyle"]().run_check(ctx)
+        assert not ctx.errors
+
+    codes = expand_codes(["W06", "C0111", "unused-import"])
+    assert "W0611" in codes and "W0612" in codes
+    assert "W0404" not in codes
+    assert {"C0111", "unused-import"} <= codes
@@ -0,0 +1,93 @@
+import io
+import json
+
+
+def test_compile_format():
+    from pylama.errors import Error
+    from pylama.output import MESSAGE_FORMATS, compile_format
+
+    err = Error(source="pycodestyle", col=4, lnum=2, text="E225 missing whitespace")
+    for pattern in MESSAGE_FORMATS.values():
+        assert compile_format(pattern)(err) == err.format(pattern)
+
+    assert compile_format("{lnum:>4}|{{raw}}")(err) == "   2|{raw}"
+    assert compile_format("static")(err) == "static"
+
+
+def test_writer(parse_args):
+    from pylama.errors import Error
+    from pylama.output import get_writer
+
+    errors = [
+        Error(text="first", number="E001", filename="a.py"),
+        Error(text="second", number="W002", type="W"),
+    ]
+
+    stream = io.StringIO()
+    with get_writer(parse_args("--format=pylint dummy.py"), stream) as writer:
+        writer.write(errors)
+    assert stream.getvalue().splitlines() == [
+        "a.py:1: [E] E001 first [pylama]",
+        ":1: [W] W002 second [pylama]",
+    ]
+
+    stream = io.StringIO()
+    with get_writer(parse_args("--format=json dummy.py"), stream) as writer:
+        writer.write(errors[:1])
+        writer.flush()
+        writer.write(errors[1:])
+    assert json.loads(stream.getvalue()) == [err.to_dict() for err in errors]
+
+    stream = io.StringIO()
+    with get_writer(parse_args("--format=json dummy.py"), stream) as writer:
+        writer.write([])
+    assert json.loads(stream.getvalue()) == []
+
+
+def test_report(tmp_path):
+    from pylama.main import shell
+
+    report = tmp_path / "report.txt"
+    errors = shell(f"-o dummy --report {report} dummy.py".split(), error=False)
+    assert errors
+    assert len(report.read_text().splitlines()) == len(errors)
+
+
+def test_jsonl(parse_args):
+    from pylama.errors import Error
+    from pylama.output import get_writer
+
+    stream = io.StringIO()
+    with get_writer(parse_args("--format=jsonl dummy.py"), stream) as writer:
+        writer.write([Error(text="first", number="E001")])
+        assert len(stream.getvalue().splitlines()) == 1
+        writer.write([Error(text="second", number="W002"), Error(text="third")])
+
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 3
+    assert json.loads(lines[1])["number"] == "W002"
+
+
+def test_sarif(parse_args):
+    from pylama.errors import Error
+    from pylama.output import get_writer
+
+    stream = io.StringIO()
+    with get_writer(parse_args("--format=sarif dummy.py"), stream) as writer:
+        writer.write([Error(source="pyflakes", text="unused", number="W0611", lnum=3)])
+        writer.write([Error(source="pylint", text="unused", number="W0611", type="W")])
+
+    log = json.loads(stream.getvalue())
+    assert log["version"] == "2.1.0"
+    run = log["runs"][0]
+    assert len(run["results"]) == 2
+    assert run["results"][0]["ruleId"] == "W0611"
+    assert run["results"][0]["locations"][0]["physicalLocation"]["region"]["startLine"] == 3
+    assert run["results"][1]["level"] == "warning"
+    (rule,) = run["tool"]["driver"]["rules"]
+    assert rule["properties"]["tags"] == ["pyflakes", "pylint"]
+
+    stream = io.StringIO()
+    with get_writer(parse_args("--format=sarif dummy.py"), stream):
+        pass
+    assert json.loads(stream.getvalue())["runs"][0]["results"] == []
@@ -0,0 +1,38 @@
+def test_schedule(tmp_path):
+    from pylama.schedule import Durations, schedule
+
+    paths = []
+    for name, size in (("big.py", 10000), ("a.py", 100), ("b.py", 100), ("c.py", 200)):
+        path = tmp_path / name
+        path.write_text("#" * size)
+        paths.append(str(path))
+
+    durations = Durations(tmp_path / "durations.json")
+    chunks = schedule(paths, durations, 1)
+    assert chunks[0] == [paths[0]]
+    assert sorted(sum(chunks, [])) == sorted(paths)
+    assert len(chunks) < len(paths)
+
+    # A small file which was slow last time goes first
+    durations.update(paths[0], 0.1)
+    durations.update(paths[1], 10)
+    durations.save()
+    chunks = schedule(paths, Durations(tmp_path / "durations.json"), 2)
+    assert chunks[0] == [paths[1]]
+
+
+def test_async_durations(parse_options, tmp_path):
+    from pylama.check_async import check_async
+
+    options = parse_options(config=False, cache_dir=str(tmp_path / "cache"))
+    assert check_async(["dummy.py"], options=options, rootdir=".")
+    assert "dummy.py" in (tmp_path / "cache" / "durations.json").read_text()
+
+
+def test_unwritable_cache(parse_options, tmp_path):
+    from pylama.check_async import check_async
+
+    cache_dir = tmp_path / "cache"
+    (cache_dir / "durations.json").mkdir(parents=True)
+    options = parse_options(config=False, cache_dir=str(cache_dir))
+    assert check_async(["dummy.py"], options=options, rootdir=".")
@@ -0,0 +1,144 @@
+import json
+import threading
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+
+def test_server(parse_options):
+    from pylama.server import LintService, make_server
+
+    options = parse_options(linters='pyflakes', config=False)
+    service = LintService(options, jobs=1, queue_size=0)
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def check(request):
+        return json.loads(urlopen(f"{url}/check", json.dumps(request).encode()).read())
+
+    try:
+        res = check({
+            "paths": ["dummy.py"],
+            "sources": [{"path": "gen/a.py", "source": "import os\n"}],
+        })
+        filenames = {err["filename"] for err in res["errors"]}
+        assert filenames == {"dummy.py", "gen/a.py"}
+
+        for source in ({"path": "gen/a.py"}, {"source": "x = 1\n"}, {"path": "", "source": ""}):
+            try:
+                check({"sources": [source]})
+                raise AssertionError("Invalid request")
+            except HTTPError as exc:
+                assert exc.code == 400
+
+        # The only slot is busy
+        service.slots.acquire()
+        try:
+            check({"paths": ["dummy.py"]})
+            raise AssertionError("The queue is full")
+        except HTTPError as exc:
+            assert exc.code == 503
+        finally:
+            service.slots.release()
+
+        metrics = json.loads(urlopen(f"{url}/metrics").read())
+        assert metrics["requests"] == 4
+        assert metrics["failed"] == 3
+        assert metrics["rejected"] == 1
+        assert metrics["files"] == 2
+        assert metrics["running"] == 0
+        assert metrics["latency"]["max"] > 0
+
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+
+def test_server_socket(tmp_path, parse_options):
+    import socket
+
+    import pytest
+
+    from pylama.server import LintService, make_server
+
+    options = parse_options(linters='pyflakes', config=False)
+    service = LintService(options, jobs=1)
+    path = tmp_path / "lint.sock"
+    try:
+        # Other files are kept
+        path.write_text("data")
+        with pytest.raises(FileExistsError):
+            make_server(service, unix_socket=str(path))
+        assert path.read_text() == "data"
+
+        # A stale socket is replaced
+        path.unlink()
+        stale = socket.socket(socket.AF_UNIX)
+        stale.bind(str(path))
+        stale.close()
+        server = make_server(service, unix_socket=str(path))
+        server.server_close()
+
+    finally:
+        service.close()
+
+
+def test_server_failures(monkeypatch, parse_options):
+    from concurrent.futures import ThreadPoolExecutor
+
+    import pylama.server
+    from pylama.server import EXECUTORS, LintService, make_server
+
+    init_worker, check_item = pylama.server.init_worker, pylama.server.check_item
+    broken = []
+
+    def init_once(*args):
+        if not broken:
+            broken.append(True)
+            raise OSError("Can't start")
+        init_worker(*args)
+
+    monkeypatch.setitem(EXECUTORS, "process", ThreadPoolExecutor)
+    monkeypatch.setattr("pylama.server.init_worker", init_once)
+    options = parse_options(linters='pyflakes', config=False)
+    service = LintService(options, jobs=1)
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def check(request):
+        try:
+            return json.loads(urlopen(f"{url}/check", json.dumps(request).encode()).read())
+        except HTTPError as exc:
+            assert exc.code == 500
+            return json.loads(exc.read())
+
+    request = {"sources": [{"path": "a.py", "source": "import os\n"}]}
+    try:
+        # The broken pool is restarted
+        pool = service.pool
+        assert "error" in check(request)
+        assert service.pool is not pool
+        assert check(request)["errors"]
+
+        def fail(path, source=None):
+            if path == "a.py":
+                raise ValueError("Linter failure")
+            return check_item(path, source)
+
+        monkeypatch.setattr("pylama.server.check_item", fail)
+        res = check({"sources": [request["sources"][0], {"path": "b.py", "source": ""}]})
+        assert "Linter failure" in res["error"]
+
+        metrics = json.loads(urlopen(f"{url}/metrics").read())
+        assert metrics["requests"] == 3
+        assert metrics["failed"] == 2
+        assert metrics["running"] == 0
+
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
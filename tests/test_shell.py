@@ -1,5 +1,7 @@
 import io
 
+import pytest
+
 
 def test_shell():
     from pylama.main import shell
@@ -10,6 +12,10 @@ def test_shell():
     errors = shell(['unknown.py'], error=False)
     assert not errors
 
+    with pytest.raises(SystemExit) as exc:
+        shell('-o dummy dummy.py'.split())
+    assert exc.value.code == 1
+
 
 def test_sort(parse_options):
     from pylama.core import run
@@ -68,3 +74,64 @@ def test_stdin(monkeypatch, parse_args):
     monkeypatch.setattr('sys.stdin', io.StringIO('unknown_call()\ndef no_doc():\n  pass\n\n'))
     options = parse_args("--from-stdin dummy.py")
     assert options.from_stdin
+
+
+def test_stdin_protocol(monkeypatch, capsys):
+    import json
+    import sys
+
+    from pylama.config import STREAM
+    from pylama.main import shell
+
+    # The logger writes to stdout by default
+    monkeypatch.setattr(STREAM, 'stream', sys.stdout)
+
+    records = [
+        {"id": 1, "path": "gen/first.py", "source": "import os\n"},
+        {"path": "gen/second.py", "source": "x = 1\n"},
+    ]
+    lines = [json.dumps(record) for record in records] + ["", "not json", '{"path": "a.py"}']
+    monkeypatch.setattr('sys.stdin', io.StringIO("\n".join(lines)))
+    total = shell(['--stdin-protocol', 'ndjson', '-l', 'pyflakes', '-v'], error=False)
+    assert total == 1
+
+    out, err = capsys.readouterr()
+    assert err
+    results = [json.loads(line) for line in out.splitlines()]
+    assert len(results) == 4
+    assert results[0]["id"] == 1
+    assert [err["filename"] for err in results[0]["errors"]] == ["gen/first.py"]
+    assert results[1] == {"path": "gen/second.py", "errors": []}
+    assert "error" in results[2]
+    assert results[3]["path"] == "a.py"
+    assert "error" in results[3]
+
+
+def test_stdin_protocol_failures(monkeypatch, parse_options):
+    import json
+
+    from pylama.api import Session
+    from pylama.protocol import serve_ndjson
+
+    check_source = Session.check_source
+
+    def fail(self, path, source):
+        if path == "fail.py":
+            raise ValueError("Linter failure")
+        return check_source(self, path, source)
+
+    monkeypatch.setattr(Session, 'check_source', fail)
+    records = [
+        {"path": "", "source": "x = 1\n"},
+        {"path": "fail.py", "source": "x = 1\n"},
+        {"path": "a.py", "source": "import os\n"},
+    ]
+    stream = io.StringIO()
+    options = parse_options(linters='pyflakes', config=False)
+    total = serve_ndjson([json.dumps(record) for record in records], stream, options)
+    assert total == 1
+
+    results = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert "Invalid record" in results[0]["error"]
+    assert "Linter failure" in results[1]["error"]
+    assert len(results[2]["errors"]) == 1
@@ -1,3 +1,6 @@
+import subprocess
+
+
 def test_git_hook():
     from pylama.hook import git_hook
 
@@ -11,3 +14,103 @@ def test_hg_hook():
     from pylama.hook import hg_hook
 
     assert not hg_hook(None, {})
+
+
+def git(*args):
+    subprocess.run(["git", *args], check=True, capture_output=True)
+
+
+def make_repo(path, monkeypatch):
+    monkeypatch.chdir(path)
+    monkeypatch.setattr("pylama.main.CURDIR", path)
+    (path / "pkg").mkdir()
+    (path / "pkg" / "__init__.py").write_text("")
+    (path / "pkg" / "base.py").write_text("VALUE = 1\n")
+    (path / "pkg" / "user.py").write_text("from .base import VALUE\n")
+    (path / "pkg" / "deep.py").write_text("from pkg import user\n")
+    (path / "other.py").write_text("import os\n")
+    git("init", "-q")
+    git("add", ".")
+    git("-c", "user.name=test", "-c", "user.email=test@test", "commit", "-qm", "init")
+
+
+def test_changed_since(tmp_path, monkeypatch, parse_options):
+    from pylama.main import check_paths, get_candidates
+    from pylama.vcs import filter_changed
+
+    make_repo(tmp_path, monkeypatch)
+    (tmp_path / "pkg" / "base.py").write_text("VALUE = 2\n")
+
+    options = parse_options([".", "--changed-since", "HEAD", "-l", "pyflakes"], config=False)
+    candidates = get_candidates(["."])
+    assert filter_changed(candidates, options) == ["pkg/base.py"]
+
+    # pyflakes doesn't need dependents
+    options.changed_dependents = True
+    assert filter_changed(candidates, options) == ["pkg/base.py"]
+
+    options.linters = ["mypy"]
+    assert sorted(filter_changed(candidates, options)) == [
+        "pkg/base.py", "pkg/deep.py", "pkg/user.py"
+    ]
+    assert (tmp_path / ".pylama_cache" / "imports.json").exists()
+
+    options.linters = ["pyflakes"]
+    options.changed_since = "unknown-ref"
+    assert filter_changed(candidates, options) == candidates
+
+    options.changed_since = "HEAD"
+    (tmp_path / "other.py").write_text("import sys\n")
+    errors = check_paths(["."], options)
+    assert [err.filename for err in errors] == ["other.py"]
+
+
+def test_parse_imports(tmp_path):
+    from pylama.imports import get_module_name, parse_imports
+
+    (tmp_path / "pkg" / "sub").mkdir(parents=True)
+    (tmp_path / "pkg" / "__init__.py").write_text("")
+    (tmp_path / "pkg" / "sub" / "__init__.py").write_text("")
+    module = tmp_path / "pkg" / "sub" / "mod.py"
+    module.write_text("import os.path\nfrom .. import base\nfrom .sibling import name\n")
+
+    assert get_module_name(str(module)) == "pkg.sub.mod"
+    assert get_module_name(str(tmp_path / "pkg" / "__init__.py")) == "pkg"
+    assert parse_imports(str(module)) == {
+        "os.path", "pkg", "pkg.base", "pkg.sub.sibling", "pkg.sub.sibling.name"
+    }
+
+
+def test_git_discovery(tmp_path, monkeypatch, parse_options):
+    from pylama.main import check_paths
+    from pylama.vcs import get_blob_hash, get_index_files
+
+    make_repo(tmp_path, monkeypatch)
+    (tmp_path / "untracked.py").write_text("import sys\n")
+    (tmp_path / "pkg" / "base.py").write_text("import re\n")
+
+    files = get_index_files(["."])
+    assert "untracked.py" not in files
+    assert files["pkg/base.py"] == get_blob_hash("pkg/base.py")
+    assert files["other.py"] == subprocess.run(
+        ["git", "hash-object", "other.py"], capture_output=True, check=True, text=True
+    ).stdout.strip()
+    assert get_index_files(["untracked.py"]) == {str(tmp_path / "untracked.py"): ""}
+
+    options = parse_options(["--discovery", "git", "-l", "pyflakes"], config=False)
+    errors = check_paths(["."], options, rootdir=tmp_path)
+    filenames = {err.filename for err in errors}
+    assert "untracked.py" not in filenames
+    assert "pkg/base.py" in filenames
+    assert (tmp_path / ".pylama_cache" / "results.json").exists()
+
+    with monkeypatch.context() as patch:
+        patch.setattr("pylama.main.iter_checks", lambda *args, **kwargs: iter(()))
+        cached = check_paths(["."], options, rootdir=tmp_path)
+    assert sorted(err.to_dict().items() for err in cached) == sorted(
+        err.to_dict().items() for err in errors
+    )
+
+    (tmp_path / "pkg" / "base.py").write_text("VALUE = 1\n")
+    errors = check_paths(["."], options, rootdir=tmp_path)
+    assert "pkg/base.py" not in {err.filename for err in errors}